@@ -1075,8 +1075,9 @@ def create_app(config_name=None):
                 if script_data and script_data.get('script'):
                     # Save script
                     output_file = f"manual_podcast_script_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        f.write(script_data['script'])
+                    # Encode once and write in a single buffered call
+                    with open(output_file, 'wb') as f:
+                        f.write(script_data['script'].encode('utf-8'))
                     
                     logger.info(f"✅ Podcast script generated: {output_file}")
                     logger.info(f"📊 Words: {script_data['metadata']['total_words']}, Duration: {script_data['metadata']['estimated_duration_minutes']} min")
@@ -1,7 +1,9 @@
 import requests
+from requests.adapters import HTTPAdapter
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Set
+from typing import Iterator, List, Dict, Optional, Set
 from hn_hidden_gems.config import Config
 from hn_hidden_gems.utils.logger import setup_logger
 
@@ -13,6 +15,12 @@ class HackerNewsAPI:
     def __init__(self):
         self.base_url = Config.HN_API_BASE
         self.session = requests.Session()
+        
+        # Keep connections to the Firebase API alive across calls and threads
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
         self.seen_posts: Set[int] = set()
         
     def get_story_ids(self, story_type: str = "new", limit: int = 100) -> List[int]:
@@ -30,6 +38,46 @@ class HackerNewsAPI:
             logger.error(f"Error fetching {story_type} stories: {e}")
             return []
     
+    def iter_story_ids(self, story_type: str = "new", limit: int = 100, first_page: int = 50) -> Iterator[int]:
+        """
+        Yield story IDs lazily, newest first for "new".
+        
+        Only the first page is requested up front, using the Firebase
+        limitToFirst query; the full list is fetched if the caller keeps going.
+        """
+        first_page = min(first_page, limit)
+        url = f"{self.base_url}/{story_type}stories.json"
+        try:
+            response = self.session.get(
+                url,
+                params={'orderBy': '"$key"', 'limitToFirst': first_page},
+                timeout=10
+            )
+            response.raise_for_status()
+            page = response.json()
+            if not isinstance(page, list):
+                raise ValueError(f"unexpected response type {type(page).__name__}")
+            page = [story_id for story_id in page if story_id is not None]
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Paged fetch of {story_type} stories failed, using full list: {e}")
+            page = []
+        
+        yield from page
+        # A short page means the list is exhausted
+        if page and (len(page) < first_page or len(page) >= limit):
+            return
+        
+        # The list may have shifted since the first page was fetched, so skip
+        # what was already yielded rather than slicing by position
+        seen = set(page)
+        remaining = limit - len(page)
+        for story_id in self.get_story_ids(story_type, limit):
+            if remaining <= 0:
+                return
+            if story_id not in seen:
+                remaining -= 1
+                yield story_id
+    
     def get_item(self, item_id: int) -> Optional[Dict]:
         """Get item details by ID."""
         try:
@@ -48,6 +96,24 @@ class HackerNewsAPI:
             logger.error(f"Error fetching item {item_id}: {e}")
             return None
     
+    def get_items(self, item_ids: List[int], max_workers: int = 16) -> List[Optional[Dict]]:
+        """Get several items concurrently, returned in the same order as item_ids."""
+        return self._fetch_concurrently(self.get_item, item_ids, max_workers)
+    
+    def get_users(self, usernames: List[str], max_workers: int = 16) -> Dict[str, Optional[Dict]]:
+        """Get several users concurrently, keyed by username."""
+        return dict(zip(usernames, self._fetch_concurrently(self.get_user, usernames, max_workers)))
+    
+    def _fetch_concurrently(self, fetch, keys: List, max_workers: int) -> List:
+        """Run a single-key fetch for every key on a thread pool, preserving order."""
+        if not keys:
+            return []
+        if len(keys) == 1:
+            return [fetch(keys[0])]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            return list(executor.map(fetch, keys))
+    
     def get_user(self, username: str) -> Optional[Dict]:
         """Get user details by username."""
         try:
@@ -29,6 +29,7 @@ class Config:
     # Application Settings
     KARMA_THRESHOLD = int(os.environ.get('KARMA_THRESHOLD', 100))
     MIN_INTEREST_SCORE = float(os.environ.get('MIN_INTEREST_SCORE', 0.3))
+    SCORE_ALL_POSTS = os.environ.get('SCORE_ALL_POSTS', 'true').lower() == 'true'
     POLL_INTERVAL_SECONDS = int(os.environ.get('POLL_INTERVAL_SECONDS', 60))
     MAX_POSTS_PER_POLL = int(os.environ.get('MAX_POSTS_PER_POLL', 100))
     
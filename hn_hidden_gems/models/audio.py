@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey
 from sqlalchemy.orm import relationship
@@ -81,6 +82,7 @@ class AudioMetadata(db.Model):
             voice_name=metadata_dict.get('voice_name'),
             audio_encoding=metadata_dict.get('audio_encoding', 'MP3'),
             estimated_duration_minutes=metadata_dict.get('estimated_duration_minutes'),
+            actual_duration_seconds=metadata_dict.get('actual_duration_seconds'),
             generation_status='completed',
             gems_count=metadata_dict.get('gems_count', 0),
             content_date=datetime.fromisoformat(metadata_dict['generated_at']) if metadata_dict.get('generated_at') else None,
@@ -91,11 +93,49 @@ class AudioMetadata(db.Model):
         db.session.add(audio_entry)
         return audio_entry
     
+    @classmethod
+    def upsert(cls, values, update_columns):
+        """
+        Insert an audio metadata row, or update it if the filename already exists
+        
+        Uses a single INSERT ... ON CONFLICT statement on SQLite and PostgreSQL
+        instead of a SELECT followed by an INSERT or UPDATE.
+        
+        Args:
+            values: Column values for the new row; must include filename
+            update_columns: Columns from values to overwrite on an existing row
+        """
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            existing = cls.find_by_filename(values['filename'])
+            if existing:
+                for column in update_columns:
+                    setattr(existing, column, values[column])
+            else:
+                db.session.add(cls(**values))
+            return
+        
+        stmt = insert(cls).values(**values)
+        update_set = {column: stmt.excluded[column] for column in update_columns}
+        # onupdate defaults don't apply to ON CONFLICT updates
+        update_set['updated_at'] = datetime.utcnow()
+        stmt = stmt.on_conflict_do_update(index_elements=['filename'], set_=update_set)
+        db.session.execute(stmt)
+    
     @classmethod
     def find_by_filename(cls, filename):
         """Find audio metadata by filename"""
         return cls.query.filter_by(filename=filename).first()
     
+    @classmethod
+    def get_all_filenames(cls):
+        """Return the set of filenames that have a metadata entry"""
+        return {filename for (filename,) in db.session.query(cls.filename)}
+    
     @classmethod
     def find_latest(cls, script_source='super-gems'):
         """Find the most recent audio file for a given source"""
@@ -220,8 +260,6 @@ class PodcastScript(db.Model):
         Returns:
             PodcastScript instance
         """
-        import hashlib
-        
         script_text = script_data['script']
         metadata = script_data['metadata']
         
@@ -261,13 +299,14 @@ class PodcastScript(db.Model):
             cls.generation_timestamp.asc()
         ).all()
     
-    def mark_audio_generated(self, audio_metadata):
+    def mark_audio_generated(self, audio_metadata, commit=True):
         """Mark this script as having audio generated"""
         self.audio_generated = True
         self.audio_generation_timestamp = datetime.utcnow()
         self.audio_metadata = audio_metadata
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
@@ -75,7 +75,10 @@ def create_indexes():
         # Users table indexes
         'CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)',
         'CREATE INDEX IF NOT EXISTS idx_users_karma ON users(karma)',
-        'CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at)'
+        'CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at)',
+        
+        # Audio metadata table indexes
+        'CREATE INDEX IF NOT EXISTS idx_audio_metadata_source_status_generated ON audio_metadata(script_source, generation_status, generation_timestamp DESC)'
     ]
     
     with db.engine.connect() as conn:
@@ -132,6 +132,14 @@ class Post(db.Model):
         """Find post by Hacker News ID."""
         return cls.query.filter_by(hn_id=hn_id).first()
     
+    @classmethod
+    def get_existing_hn_ids(cls, hn_ids):
+        """Return the subset of the given Hacker News IDs that are already stored."""
+        if not hn_ids:
+            return set()
+        rows = db.session.query(cls.hn_id).filter(cls.hn_id.in_(hn_ids))
+        return {hn_id for (hn_id,) in rows}
+    
     @classmethod
     def get_hidden_gems(cls, limit=50, karma_threshold=50, min_interest_score=0.5):
         """Get current hidden gems."""
@@ -221,12 +229,13 @@ class Post(db.Model):
         return False
     
     @classmethod
-    def get_duplicate_candidates(cls, post):
+    def get_duplicate_candidates(cls, post, pending_posts=None):
         """
         Find potential duplicates for a given post.
         
         Args:
             post: Post object to find duplicates for
+            pending_posts: Unsaved posts (e.g. a batch awaiting insert) to check as well
             
         Returns:
             List of potential duplicate posts with similarity scores
@@ -260,6 +269,8 @@ class Post(db.Model):
         
         # Combine all candidate posts (remove duplicates)
         all_candidates = list({p.id: p for p in (same_author_posts + similar_url_posts + recent_posts)}.values())
+        if pending_posts:
+            all_candidates.extend(p for p in pending_posts if p is not post)
         
         # Check each candidate for duplicates
         candidates_with_scores = []
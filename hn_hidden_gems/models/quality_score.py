@@ -79,6 +79,21 @@ class QualityScore(db.Model):
         if analysis_time_ms:
             self.analysis_time_ms = analysis_time_ms
     
+    @classmethod
+    def row_from_scores(cls, scores_dict, post_id=None):
+        """Build a plain column mapping from analyzer results, for Core bulk inserts."""
+        return {
+            'post_id': post_id,
+            'technical_depth': scores_dict.get('technical_depth', 0.0),
+            'originality': scores_dict.get('originality', 0.0),
+            'problem_solving': scores_dict.get('problem_solving', 0.0),
+            'spam_likelihood': scores_dict.get('spam_likelihood', 0.0),
+            'overall_interest': scores_dict.get('overall_interest', 0.0),
+            'github_quality': scores_dict.get('github_quality', 0.0),
+            'domain_reputation': scores_dict.get('domain_reputation', 0.0),
+            'analyzed_at': datetime.utcnow()
+        }
+    
     def add_manual_override(self, score, notes, updated_by):
         """Add manual score override."""
         self.manual_override = True
@@ -97,6 +97,24 @@ class User(db.Model):
         
         return user
     
+    @classmethod
+    def find_or_create_many(cls, hn_data_by_username):
+        """Find or create several users with a single lookup query."""
+        usernames = list(hn_data_by_username)
+        users = {user.username: user for user in cls.query.filter(cls.username.in_(usernames))} if usernames else {}
+        
+        for username in usernames:
+            hn_data = hn_data_by_username[username]
+            user = users.get(username)
+            if not user:
+                user = cls(username=username)
+                db.session.add(user)
+                users[username] = user
+            if hn_data:
+                user.update_from_hn_data(hn_data)
+        
+        return users
+    
     @classmethod
     def get_low_karma_users(cls, karma_threshold=50):
         """Get users with karma below threshold."""
@@ -4,44 +4,164 @@ Background scheduler for HN Hidden Gems using APScheduler (no Redis required).
 """
 
 import os
+import json
+import itertools
+import queue
+import concurrent.futures
+import tempfile
 import threading
 import time
-from datetime import datetime, timedelta
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import insert
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.events import (
+    EVENT_JOB_ADDED, EVENT_JOB_REMOVED, EVENT_JOB_MODIFIED,
+    EVENT_JOB_SUBMITTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED,
+    EVENT_SCHEDULER_START
+)
 
 from hn_hidden_gems.utils.logger import setup_logger
+from hn_hidden_gems.utils.ttl_cache import TTLCache
 from hn_hidden_gems.api.hn_api import HackerNewsAPI
 from hn_hidden_gems.analyzer.quality_analyzer import QualityAnalyzer
 from hn_hidden_gems.models import Post, User, QualityScore, HallOfFame, db
 
+try:
+    import ijson  # Optional: stream-parse large super gems files
+except ImportError:
+    ijson = None
+
 logger = setup_logger(__name__)
 
+def _has_pending_changes(session):
+    """Check whether the session holds unflushed or uncommitted ORM changes."""
+    return bool(session.new or session.dirty or session.deleted)
+
+def _rollback_if_needed():
+    """Roll back the session only when there is something to discard."""
+    session = db.session
+    # A failed flush leaves the session inactive, which always needs a rollback
+    if _has_pending_changes(session) or not session.is_active:
+        session.rollback()
+
+# Immutable stats snapshot; writers swap the whole reference so readers never see a torn update
+CollectionStats = namedtuple(
+    'CollectionStats',
+    'last_run last_duration posts_collected gems_found total_runs errors status'
+)
+
+# One prefetched story handed from the HN fetch thread to the collection loop;
+# post_data is None for stories that should only be counted as processed;
+# analysis is a future for the quality scores, or None if analysis was skipped
+FetchedStory = namedtuple('FetchedStory', 'story_id post_data author_data error analysis', defaults=(None,))
+
+# Maximum number of stories fetched ahead of the analysis loop
+PREFETCH_QUEUE_SIZE = 50
+
+# HN user profiles are reused across collection runs for this long; karma
+# moves slowly enough that an hour-old value doesn't change gem decisions much
+USER_CACHE_TTL_SECONDS = 3600
+USER_CACHE_MAX_SIZE = 10000
+
+# Quality analyses run concurrently per collection; the analyzer spends most
+# of its time waiting on the GitHub API rather than on CPU
+ANALYSIS_WORKERS = 4
+
+# Stories fetched concurrently per round trip; small enough that little is
+# fetched past the time-window cutoff
+FETCH_BATCH_SIZE = 16
+
+# An analyzed post waiting for the next bulk insert, with the author profile
+# needed to recreate its user row if the batch has to be retried
+PendingPost = namedtuple('PendingPost', 'post score_row user_data')
+
+def _author_profile(author_data, now_ts):
+    """Return (karma, created timestamp, account age in days) from HN user data."""
+    author_karma = author_data.get('karma', 0) if author_data else 0
+    account_created = author_data.get('created', 0) if author_data else 0
+    
+    # Calculate account age in days
+    if account_created > 0:
+        account_age_days = (now_ts - account_created) // 86400
+    else:
+        account_age_days = 0
+    
+    return author_karma, account_created, account_age_days
+
+def _column_values(instance):
+    """Column values set on a transient model instance, as a bulk insert mapping."""
+    values = {}
+    for column in instance.__table__.columns:
+        value = getattr(instance, column.key)
+        # Leave unset columns out so their column defaults apply
+        if value is not None:
+            values[column.key] = value
+    return values
+
+def _write_text_atomic(path, text):
+    """
+    Write text with one buffered write to a temp file, then rename it into place.
+    Throwaway scripts don't need durability, so no fsync is issued.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.txt')
+    try:
+        # mkstemp creates files as 0600; match what open() would have produced
+        os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 class PostCollectionScheduler:
     """Scheduler for regular post collection without Redis dependency."""
     
     def __init__(self, app=None):
         self.app = app
         self.scheduler = None
-        self._collection_stats = {
-            'last_run': None,
-            'last_duration': None,
-            'posts_collected': 0,
-            'gems_found': 0,
-            'total_runs': 0,
-            'errors': 0,
-            'status': 'stopped'
-        }
+        self._stats_ref = CollectionStats(
+            last_run=None,
+            last_duration=None,
+            posts_collected=0,
+            gems_found=0,
+            total_runs=0,
+            errors=0,
+            status='stopped'
+        )
+        # Serializes stats writers (collection thread, start/stop from Flask);
+        # readers take the immutable snapshot without locking
+        self._stats_lock = threading.Lock()
         self._collection_lock = threading.Lock()
+        self._status_config = None
+        self._jobs_snapshot = None
+        self._jobs_snapshot_version = 0
+        self._super_gems_cache = None
+        self._hn_api = None
+        self._user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
         
     def init_app(self, app):
         """Initialize with Flask app."""
         self.app = app
         
+        # Shared HN client so every job reuses the same pooled connections
+        self._hn_api = HackerNewsAPI()
+        
         # Configure scheduler
+        # Short HN API jobs run on the 'io' pool so long-running LLM/TTS work on
+        # the 'heavy' pool can never starve the collection cadence. Every job is
+        # routed explicitly, so 'default' only exists because APScheduler requires it.
         executors = {
-            'default': ThreadPoolExecutor(max_workers=2)
+            'default': ThreadPoolExecutor(max_workers=1),
+            'io': ThreadPoolExecutor(max_workers=8),
+            'heavy': ThreadPoolExecutor(max_workers=1)
         }
         
         job_defaults = {
@@ -56,6 +176,16 @@ class PostCollectionScheduler:
             timezone='UTC'
         )
         
+        # Job next-run times only change on these events, so the serialized
+        # job list used by get_status is rebuilt lazily after one of them
+        self.scheduler.add_listener(
+            self._invalidate_jobs_snapshot,
+            EVENT_JOB_ADDED | EVENT_JOB_REMOVED | EVENT_JOB_MODIFIED |
+            EVENT_JOB_SUBMITTED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED |
+            EVENT_SCHEDULER_START
+        )
+        self._status_config = self._build_status_config()
+        
         # Configure collection job based on settings
         self._configure_collection_job()
         self._configure_hall_of_fame_job()
@@ -82,6 +212,7 @@ class PostCollectionScheduler:
                 trigger=IntervalTrigger(minutes=collection_interval),
                 id='collect_posts',
                 name=f'Collect HN posts every {collection_interval} minutes',
+                executor='io',
                 replace_existing=True
             )
             logger.info(f"Scheduled post collection every {collection_interval} minutes")
@@ -108,6 +239,7 @@ class PostCollectionScheduler:
                 trigger=IntervalTrigger(hours=hof_interval),
                 id='monitor_hall_of_fame',
                 name=f'Monitor Hall of Fame every {hof_interval} hours',
+                executor='io',
                 replace_existing=True
             )
             logger.info(f"Scheduled Hall of Fame monitoring every {hof_interval} hours")
@@ -134,6 +266,7 @@ class PostCollectionScheduler:
                 trigger=IntervalTrigger(hours=super_gems_interval),
                 id='analyze_super_gems',
                 name=f'Analyze super gems every {super_gems_interval} hours',
+                executor='heavy',
                 replace_existing=True
             )
             logger.info(f"Scheduled super gems analysis every {super_gems_interval} hours")
@@ -165,12 +298,12 @@ class PostCollectionScheduler:
         if self.scheduler and not self.scheduler.running:
             try:
                 self.scheduler.start()
-                self._collection_stats['status'] = 'running'
+                self._update_stats(status='running')
                 logger.info("Post collection scheduler started")
                 return True
             except Exception as e:
                 logger.error(f"Failed to start scheduler: {e}")
-                self._collection_stats['status'] = 'error'
+                self._update_stats(status='error')
                 return False
         return False
     
@@ -179,7 +312,7 @@ class PostCollectionScheduler:
         if self.scheduler and self.scheduler.running:
             try:
                 self.scheduler.shutdown(wait=True)
-                self._collection_stats['status'] = 'stopped'
+                self._update_stats(status='stopped')
                 logger.info("Post collection scheduler stopped")
                 return True
             except Exception as e:
@@ -187,32 +320,72 @@ class PostCollectionScheduler:
                 return False
         return False
     
+    def _update_stats(self, count_run=False, **changes):
+        """
+        Publish a new stats snapshot with the given fields replaced.
+        With count_run, total_runs is incremented under the same lock.
+        """
+        with self._stats_lock:
+            if count_run:
+                changes['total_runs'] = self._stats_ref.total_runs + 1
+            self._stats_ref = self._stats_ref._replace(**changes)
+    
     def is_running(self):
         """Check if scheduler is running."""
         return self.scheduler and self.scheduler.running
     
-    def get_status(self):
-        """Get current status and statistics."""
+    def _build_status_config(self):
+        """Read the interval settings reported by get_status."""
+        interval_minutes = int(os.environ.get('POST_COLLECTION_INTERVAL_MINUTES', 5))
+        hof_interval_hours = int(os.environ.get('HALL_OF_FAME_INTERVAL_HOURS', 6))
+        super_gems_interval_hours = int(os.environ.get('SUPER_GEMS_INTERVAL_HOURS', 6))
+        
+        return {
+            'enabled': interval_minutes > 0,
+            'interval_minutes': interval_minutes,
+            'hof_enabled': hof_interval_hours > 0,
+            'hof_interval_hours': hof_interval_hours,
+            'super_gems_enabled': super_gems_interval_hours > 0,
+            'super_gems_interval_hours': super_gems_interval_hours
+        }
+    
+    def _invalidate_jobs_snapshot(self, event=None):
+        """Drop the cached job list after the scheduler changes it."""
+        self._jobs_snapshot_version += 1
+        self._jobs_snapshot = None
+    
+    def _get_jobs_snapshot(self):
+        """Get the serialized job list, rebuilding it only when invalidated."""
+        jobs = self._jobs_snapshot
+        if jobs is not None:
+            return jobs
+        
+        version = self._jobs_snapshot_version
         jobs = []
         if self.scheduler:
             for job in self.scheduler.get_jobs():
+                next_run_time = getattr(job, 'next_run_time', None)
                 jobs.append({
                     'id': job.id,
                     'name': job.name,
-                    'next_run': job.next_run_time.isoformat() if job.next_run_time else None,
+                    'next_run': next_run_time.isoformat() if next_run_time else None,
                     'trigger': str(job.trigger)
                 })
         
+        # Only publish the snapshot if no invalidation happened while building it
+        if version == self._jobs_snapshot_version:
+            self._jobs_snapshot = jobs
+        return jobs
+    
+    def get_status(self):
+        """Get current status and statistics."""
+        status_config = self._status_config or self._build_status_config()
+        
         return {
-            'enabled': int(os.environ.get('POST_COLLECTION_INTERVAL_MINUTES', 5)) > 0,
+            **status_config,
             'running': self.is_running(),
-            'interval_minutes': int(os.environ.get('POST_COLLECTION_INTERVAL_MINUTES', 5)),
-            'hof_enabled': int(os.environ.get('HALL_OF_FAME_INTERVAL_HOURS', 6)) > 0,
-            'hof_interval_hours': int(os.environ.get('HALL_OF_FAME_INTERVAL_HOURS', 6)),
-            'super_gems_enabled': int(os.environ.get('SUPER_GEMS_INTERVAL_HOURS', 6)) > 0,
-            'super_gems_interval_hours': int(os.environ.get('SUPER_GEMS_INTERVAL_HOURS', 6)),
-            'jobs': jobs,
-            'stats': self._collection_stats.copy()
+            'jobs': self._get_jobs_snapshot(),
+            'stats': self._stats_ref._asdict()
         }
     
     def collect_now(self, minutes_back=60):
@@ -220,7 +393,20 @@ class PostCollectionScheduler:
         if not self.app:
             raise Exception("Scheduler not initialized with Flask app")
             
-        # Run collection in a separate thread to avoid blocking
+        if self.is_running():
+            # Run on the io pool like scheduled collections; the fixed id folds
+            # repeated requests into one pending run instead of a thread each
+            self.scheduler.add_job(
+                func=self._collect_posts_manual,
+                args=(minutes_back,),
+                id='collect_now',
+                name=f'Manual collection of last {minutes_back} minutes',
+                executor='io',
+                replace_existing=True
+            )
+            return True
+        
+        # Without a running scheduler (e.g. from the CLI), use a one-off thread
         thread = threading.Thread(
             target=self._collect_posts_manual,
             args=(minutes_back,),
@@ -281,21 +467,30 @@ class PostCollectionScheduler:
             return
         
         start_time = datetime.utcnow()
+        start_mono = time.monotonic()
+        
+        # Nothing in the run queries pending changes, and committed rows are never
+        # read back, so skip autoflush and post-commit expiry; restored when done
+        session = db.session()
+        session_options = (session.autoflush, session.expire_on_commit)
+        session.autoflush = False
+        session.expire_on_commit = False
         
         try:
-            self._collection_stats['status'] = 'collecting'
+            self._update_stats(status='collecting')
             logger.info(f"Starting collection of posts from last {minutes_back} minutes")
             
             # Initialize APIs
-            hn_api = HackerNewsAPI()
+            hn_api = self._hn_api or HackerNewsAPI()
             analyzer = QualityAnalyzer()
             
-            # Calculate time window
-            cutoff_time = datetime.utcnow() - timedelta(minutes=minutes_back)
+            # Calculate time window as unix timestamps so the loop compares ints
+            now_ts = int(time.time())
+            cutoff_ts = now_ts - minutes_back * 60
             
-            # Get recent story IDs
+            # Get recent story IDs lazily; short windows stop within the first page
             max_stories = int(os.environ.get('POST_COLLECTION_MAX_STORIES', 500))
-            story_ids = hn_api.get_story_ids('new', limit=max_stories)
+            story_ids = hn_api.iter_story_ids('new', limit=max_stories)
             
             posts_processed = 0
             posts_created = 0
@@ -303,196 +498,358 @@ class PostCollectionScheduler:
             errors = 0
             batch_size = int(os.environ.get('POST_COLLECTION_BATCH_SIZE', 25))
             
-            for story_id in story_ids:
-                try:
-                    # Check if we already have this post
-                    existing_post = Post.find_by_hn_id(story_id)
-                    if existing_post:
-                        posts_processed += 1
-                        continue
+            # Gem thresholds are read once per run rather than per post. Posts from
+            # authors at or above the karma threshold can never be gems; unless
+            # every post should be scored, they skip the analyzer
+            karma_threshold = int(os.environ.get('KARMA_THRESHOLD', 100))
+            min_interest_score = float(os.environ.get('MIN_INTEREST_SCORE', 0.3))
+            score_all_posts = os.environ.get('SCORE_ALL_POSTS', 'true').lower() == 'true'
+            
+            # Analyses are submitted as stories are prefetched, so their GitHub API
+            # lookups overlap with each other and with the inserts done here
+            analysis_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=ANALYSIS_WORKERS,
+                thread_name_prefix='hn-analyze'
+            )
+            
+            def submit_analysis(post_data, author_data):
+                author_karma, _, account_age_days = _author_profile(author_data, now_ts)
+                if not score_all_posts and author_karma >= karma_threshold:
+                    return None
+                return analysis_pool.submit(analyzer.analyze_post_quality, {
+                    **post_data,
+                    'author_karma': author_karma,
+                    'account_age_days': account_age_days
+                })
+            
+            # Fetch items and authors on a producer thread so HN round-trips overlap
+            # with analysis and commits here; the bounded queue caps the read-ahead
+            fetch_queue = queue.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+            stop_event = threading.Event()
+            producer = threading.Thread(
+                target=self._prefetch_stories,
+                args=(hn_api, story_ids, cutoff_ts, minutes_back,
+                      submit_analysis, fetch_queue, stop_event),
+                name='hn-prefetch',
+                daemon=True
+            )
+            producer.start()
+            
+            # Analyzed posts are inserted batch_size at a time with bulk INSERTs
+            pending_batch = []
+            
+            try:
+                while True:
+                    fetched = fetch_queue.get()
                     
-                    # Get post data
-                    post_data = hn_api.get_item(story_id)
-                    if not post_data or post_data.get('type') != 'story':
-                        posts_processed += 1
-                        continue
+                    if pending_batch and (fetched is None or len(pending_batch) >= batch_size):
+                        stored, failed = self._store_post_batch(pending_batch)
+                        posts_created += len(stored)
+                        posts_processed += len(pending_batch)
+                        errors += failed
+                        
+                        for pending in stored:
+                            if pending.post.is_hidden_gem:
+                                gems_found += 1
+                                logger.info(f"Found gem {pending.post.hn_id}: {pending.post.title[:50]}... (score: {pending.score_row['overall_interest']:.2f})")
+                        
+                        logger.info(f"Progress: {posts_created} posts created, {gems_found} gems found")
+                        pending_batch = []
                     
-                    # Check if post is within our time window
-                    post_time = datetime.fromtimestamp(post_data.get('time', 0))
-                    if post_time < cutoff_time:
-                        # Posts are ordered by recency, so we can break here
-                        logger.info(f"Reached posts older than {minutes_back} minutes, stopping")
+                    if fetched is None:
                         break
                     
-                    # Skip posts without titles
-                    if not post_data.get('title'):
+                    story_id = fetched.story_id
+                    if fetched.error:
+                        errors += 1
                         posts_processed += 1
                         continue
                     
-                    # Double-check for existing post to avoid race conditions
-                    existing_post = Post.find_by_hn_id(story_id)
-                    if existing_post:
+                    if fetched.post_data is None:
+                        # Already stored, not a story, or missing a title
                         posts_processed += 1
                         continue
                     
-                    # Get author information
-                    author_data = hn_api.get_user(post_data['by']) if post_data.get('by') else {}
-                    author_karma = author_data.get('karma', 0) if author_data else 0
-                    account_created = author_data.get('created', 0) if author_data else 0
+                    post_data = fetched.post_data
+                    author_data = fetched.author_data
+                    post_ts = post_data.get('time', 0)
                     
-                    # Calculate account age in days
-                    if account_created > 0:
-                        account_age_days = (datetime.utcnow() - datetime.fromtimestamp(account_created)).days
-                    else:
-                        account_age_days = 0
-                    
-                    # Create or update user
-                    user = User.find_or_create(post_data['by'], {
-                        'karma': author_karma,
-                        'created': account_created
-                    })
-                    
-                    # Create post
-                    post = Post(
-                        hn_id=story_id,
-                        title=post_data.get('title', ''),
-                        url=post_data.get('url'),
-                        text=post_data.get('text'),
-                        author=post_data['by'],
-                        author_karma=author_karma,
-                        account_age_days=account_age_days,
-                        score=post_data.get('score', 0),
-                        descendants=post_data.get('descendants', 0),
-                        hn_created_at=post_time
-                    )
-                    
-                    # Analyze quality
-                    quality_scores = analyzer.analyze_post_quality({
-                        **post_data,
-                        'author_karma': author_karma,
-                        'account_age_days': account_age_days
-                    })
-                    
-                    # Create quality score
-                    quality_score = QualityScore(post=post)
-                    quality_score.update_scores(quality_scores)
-                    
-                    # Determine if it's a hidden gem
-                    karma_threshold = int(os.environ.get('KARMA_THRESHOLD', 100))
-                    min_interest_score = float(os.environ.get('MIN_INTEREST_SCORE', 0.3))
-                    
-                    is_gem = (
-                        author_karma < karma_threshold and
-                        quality_scores['overall_interest'] >= min_interest_score and
-                        quality_scores['spam_likelihood'] < 0.4
-                    )
-                    post.is_hidden_gem = is_gem
-                    post.is_spam = quality_scores['spam_likelihood'] >= 0.7
-                    
-                    # Check for duplicates before committing
-                    duplicate_candidates = Post.get_duplicate_candidates(post)
-                    if duplicate_candidates:
-                        # This appears to be a duplicate
-                        logger.info(f"Post {story_id} appears to be a duplicate, marking as spam")
-                        post.is_spam = True
-                        post.is_hidden_gem = False
-                        
-                        # Log the duplicate detection
-                        best_match = duplicate_candidates[0]
-                        logger.info(f"  Duplicate of HN ID {best_match['post'].hn_id} (confidence: {best_match['similarity']['confidence_score']:.2f})")
-                        logger.info(f"  Reasons: {', '.join(best_match['similarity']['duplicate_reasons'])}")
-                    
-                    # Add to session
-                    db.session.add(post)
-                    db.session.add(quality_score)
-                    
-                    # Try to commit this individual post
                     try:
-                        db.session.commit()
-                        posts_created += 1
+                        author_karma, account_created, account_age_days = _author_profile(author_data, now_ts)
                         
-                        if is_gem:
-                            gems_found += 1
-                            logger.info(f"Found gem {story_id}: {post_data.get('title', '')[:50]}... (score: {quality_scores['overall_interest']:.2f})")
+                        # User rows are created or updated per batch in _store_post_batch
+                        user_data = {
+                            'karma': author_karma,
+                            'created': account_created
+                        }
                         
-                        # Log progress every batch_size posts
-                        if posts_created % batch_size == 0:
-                            logger.info(f"Progress: {posts_created} posts created, {gems_found} gems found")
-                            
-                    except Exception as commit_error:
-                        # Handle unique constraint violations gracefully
-                        db.session.rollback()
-                        if "UNIQUE constraint failed: posts.hn_id" in str(commit_error):
-                            # This is expected when posts are processed multiple times
-                            logger.debug(f"Post {story_id} already exists, skipping duplicate")
-                            posts_processed += 1
+                        # Create post
+                        post = Post(
+                            hn_id=story_id,
+                            title=post_data.get('title', ''),
+                            url=post_data.get('url'),
+                            text=post_data.get('text'),
+                            author=post_data['by'],
+                            author_karma=author_karma,
+                            account_age_days=account_age_days,
+                            score=post_data.get('score', 0),
+                            descendants=post_data.get('descendants', 0),
+                            hn_created_at=datetime.fromtimestamp(post_ts)
+                        )
+                        
+                        # Quality analysis was started by the prefetch thread
+                        if fetched.analysis is not None:
+                            quality_scores = fetched.analysis.result()
                         else:
-                            logger.error(f"Failed to commit post {story_id}: {commit_error}")
-                            errors += 1
-                            posts_processed += 1
-                        continue
+                            # Stored with zero scores; row_from_scores fills in the rest
+                            quality_scores = {'overall_interest': 0.0, 'spam_likelihood': 0.0}
+                        
+                        # Quality scores are inserted as plain rows once the post has an id
+                        score_row = QualityScore.row_from_scores(quality_scores)
+                        
+                        # Determine if it's a hidden gem
+                        is_gem = (
+                            author_karma < karma_threshold and
+                            quality_scores['overall_interest'] >= min_interest_score and
+                            quality_scores['spam_likelihood'] < 0.4
+                        )
+                        post.is_hidden_gem = is_gem
+                        post.is_spam = quality_scores['spam_likelihood'] >= 0.7
+                        
+                        # Check for duplicates before committing, including posts still waiting in
+                        # the batch. The check can only mark a post as spam, so skip the candidate
+                        # scan when it already is.
+                        duplicate_candidates = None if post.is_spam else Post.get_duplicate_candidates(
+                            post, pending_posts=[pending.post for pending in pending_batch]
+                        )
+                        if duplicate_candidates:
+                            # This appears to be a duplicate
+                            logger.info(f"Post {story_id} appears to be a duplicate, marking as spam")
+                            post.is_spam = True
+                            post.is_hidden_gem = False
+                            
+                            # Log the duplicate detection
+                            best_match = duplicate_candidates[0]
+                            logger.info(f"  Duplicate of HN ID {best_match['post'].hn_id} (confidence: {best_match['similarity']['confidence_score']:.2f})")
+                            logger.info(f"  Reasons: {', '.join(best_match['similarity']['duplicate_reasons'])}")
+                        
+                        pending_batch.append(PendingPost(post, score_row, user_data))
                     
-                    posts_processed += 1
-                
-                except Exception as e:
-                    logger.error(f"Error processing post {story_id}: {e}")
-                    # Rollback any pending transaction
-                    try:
-                        db.session.rollback()
-                    except:
-                        pass
-                    errors += 1
-                    posts_processed += 1
-                    continue
+                    except Exception as e:
+                        logger.error(f"Error processing post {story_id}: {e}")
+                        # Rollback any pending transaction
+                        try:
+                            _rollback_if_needed()
+                        except:
+                            pass
+                        errors += 1
+                        posts_processed += 1
+                        continue
+            
+            finally:
+                stop_event.set()
+                producer.join(timeout=5)
+                analysis_pool.shutdown(wait=False, cancel_futures=True)
             
             # Ensure any remaining items are committed
-            try:
-                db.session.commit()
-            except:
-                db.session.rollback()
+            if _has_pending_changes(db.session):
+                try:
+                    time.sleep(0)
+                    db.session.commit()
+                except:
+                    db.session.rollback()
             
             # Update statistics
-            duration = (datetime.utcnow() - start_time).total_seconds()
-            self._collection_stats.update({
-                'last_run': start_time.isoformat(),
-                'last_duration': duration,
-                'posts_collected': posts_created,
-                'gems_found': gems_found,
-                'total_runs': self._collection_stats['total_runs'] + 1,
-                'errors': errors,
-                'status': 'running'
-            })
+            duration = time.monotonic() - start_mono
+            self._update_stats(
+                last_run=start_time.isoformat(),
+                last_duration=duration,
+                posts_collected=posts_created,
+                gems_found=gems_found,
+                errors=errors,
+                status='running',
+                count_run=True
+            )
             
             logger.info(f"Collection completed: {posts_created} new posts, {gems_found} gems found, {errors} errors in {duration:.1f}s")
             
         except Exception as e:
             logger.error(f"Collection failed: {e}")
             try:
-                db.session.rollback()
+                _rollback_if_needed()
             except:
                 pass
-            self._collection_stats.update({
-                'status': 'error',
-                'errors': errors + 1,
-                'last_run': start_time.isoformat(),
-                'last_duration': (datetime.utcnow() - start_time).total_seconds()
-            })
+            self._update_stats(
+                status='error',
+                errors=errors + 1,
+                last_run=start_time.isoformat(),
+                last_duration=time.monotonic() - start_mono
+            )
             
         finally:
+            session.autoflush, session.expire_on_commit = session_options
             self._collection_lock.release()
     
+    def _store_post_batch(self, batch):
+        """
+        Insert a batch of analyzed posts and their quality scores with one bulk
+        INSERT per table and a single commit.
+        
+        If the batch fails (usually a post stored by a concurrent run), it is
+        retried one post at a time so the rest of the batch still lands.
+        
+        Returns:
+            Tuple of (stored PendingPost list, number of failed posts)
+        """
+        # Yield the GIL before the ORM-heavy write so web requests waiting on it
+        # run now instead of after the whole batch
+        time.sleep(0)
+        
+        try:
+            User.find_or_create_many({pending.post.author: pending.user_data for pending in batch})
+            self._bulk_insert_posts(batch)
+            db.session.commit()
+            return list(batch), 0
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Bulk insert of {len(batch)} posts failed, retrying individually: {e}")
+        
+        stored = []
+        failed = 0
+        for pending in batch:
+            try:
+                User.find_or_create_many({pending.post.author: pending.user_data})
+                self._bulk_insert_posts([pending])
+                db.session.commit()
+                stored.append(pending)
+            except Exception as commit_error:
+                # Handle unique constraint violations gracefully
+                db.session.rollback()
+                if "UNIQUE constraint failed: posts.hn_id" in str(commit_error):
+                    # This is expected when posts are processed multiple times
+                    logger.debug(f"Post {pending.post.hn_id} already exists, skipping duplicate")
+                else:
+                    logger.error(f"Failed to commit post {pending.post.hn_id}: {commit_error}")
+                    failed += 1
+        
+        return stored, failed
+    
+    def _bulk_insert_posts(self, batch):
+        """Add bulk INSERTs for the batch's posts and quality scores to the session."""
+        post_rows = [_column_values(pending.post) for pending in batch]
+        # return_defaults fills in each row's primary key for the score rows
+        db.session.bulk_insert_mappings(Post, post_rows, return_defaults=True)
+        
+        # Scores skip the ORM entirely: one Core executemany INSERT
+        score_rows = [
+            {**pending.score_row, 'post_id': post_row['id']}
+            for post_row, pending in zip(post_rows, batch)
+        ]
+        db.session.execute(insert(QualityScore.__table__), score_rows)
+    
+    def _prefetch_stories(self, hn_api, story_ids, cutoff_ts, minutes_back,
+                          submit_analysis, out_queue, stop_event):
+        """
+        Fetch story items and their authors for _collect_posts, in story order,
+        and start each story's quality analysis via submit_analysis.
+        Runs on its own thread; always ends by queueing None.
+        """
+        # Authors often submit several stories per window; the shared TTL cache
+        # means each is fetched at most once per run and rarely across runs
+        user_cache = self._user_cache
+        
+        def put(item):
+            # Give up once the consumer has stopped so this thread can't block forever
+            while not stop_event.is_set():
+                try:
+                    out_queue.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        try:
+            story_ids = iter(story_ids)
+            while not stop_event.is_set():
+                batch_ids = list(itertools.islice(story_ids, FETCH_BATCH_SIZE))
+                if not batch_ids:
+                    break
+                
+                try:
+                    # Check which posts we already have and fetch the rest concurrently
+                    stored_ids = self._find_stored_ids(batch_ids)
+                    new_ids = [story_id for story_id in batch_ids if story_id not in stored_ids]
+                    items = dict(zip(new_ids, hn_api.get_items(new_ids)))
+                    
+                    # Fetch the authors of in-window stories concurrently, each once per run
+                    authors = {
+                        item['by'] for item in items.values()
+                        if item and item.get('type') == 'story' and item.get('by')
+                        and item.get('time', 0) >= cutoff_ts and item.get('title')
+                        and item['by'] not in user_cache
+                    }
+                    for author, author_data in hn_api.get_users(list(authors)).items():
+                        # Leave failed lookups uncached so a later batch or run retries them
+                        if author_data is not None:
+                            user_cache.set(author, author_data)
+                
+                except Exception as e:
+                    logger.error(f"Error fetching posts {batch_ids[0]}-{batch_ids[-1]}: {e}")
+                    for story_id in batch_ids:
+                        put(FetchedStory(story_id, None, None, True))
+                    continue
+                
+                reached_cutoff = False
+                for story_id in batch_ids:
+                    # Already stored
+                    if story_id not in items:
+                        put(FetchedStory(story_id, None, None, False))
+                        continue
+                    
+                    post_data = items[story_id]
+                    if not post_data or post_data.get('type') != 'story':
+                        put(FetchedStory(story_id, None, None, False))
+                        continue
+                    
+                    # Check if post is within our time window
+                    if post_data.get('time', 0) < cutoff_ts:
+                        # Posts are ordered by recency, so we can break here
+                        logger.info(f"Reached posts older than {minutes_back} minutes, stopping")
+                        reached_cutoff = True
+                        break
+                    
+                    # Skip posts without titles
+                    if not post_data.get('title'):
+                        put(FetchedStory(story_id, None, None, False))
+                        continue
+                    
+                    author = post_data.get('by')
+                    author_data = user_cache.get(author, {}) if author else {}
+                    analysis = submit_analysis(post_data, author_data)
+                    put(FetchedStory(story_id, post_data, author_data, False, analysis))
+                
+                if reached_cutoff:
+                    break
+        finally:
+            put(None)
+    
+    def _find_stored_ids(self, hn_ids):
+        """Return which of hn_ids are already stored, with one IN query."""
+        with self.app.app_context():
+            return Post.get_existing_hn_ids(hn_ids)
+    
     def _monitor_hall_of_fame(self):
         """
         Monitor discovered gems for success and update Hall of Fame.
         Runs within Flask app context.
         """
-        start_time = datetime.utcnow()
+        start_mono = time.monotonic()
         
         try:
             logger.info("Starting Hall of Fame monitoring...")
             
             # Initialize HN API
-            hn_api = HackerNewsAPI()
+            hn_api = self._hn_api or HackerNewsAPI()
             
             # Get all hidden gems that aren't spam
             gems = Post.query.filter(
@@ -565,7 +922,7 @@ class PostCollectionScheduler:
                 logger.info(f"  - Existing entries updated: {updated_entries}")
                 logger.info(f"  - Total gems monitored: {len(gems)}")
                 logger.info(f"  - Errors: {errors}")
-                logger.info(f"  - Duration: {(datetime.utcnow() - start_time).total_seconds():.1f}s")
+                logger.info(f"  - Duration: {time.monotonic() - start_mono:.1f}s")
             except Exception as e:
                 logger.error(f"Failed to commit Hall of Fame updates: {e}")
                 db.session.rollback()
@@ -573,7 +930,7 @@ class PostCollectionScheduler:
         except Exception as e:
             logger.error(f"Hall of Fame monitoring failed: {e}")
             try:
-                db.session.rollback()
+                _rollback_if_needed()
             except:
                 pass
     
@@ -618,6 +975,9 @@ class PostCollectionScheduler:
             # Run analysis in async context
             asyncio.run(analyzer.run_analysis(hours=analysis_hours, top_n=top_n))
             
+            # The analyzer rewrote super-gems.json; don't trust the parsed copy
+            self._super_gems_cache = None
+            
             logger.info("Super gems analysis completed")
             
             # Trigger podcast generation after super gems analysis completes
@@ -632,15 +992,62 @@ class PostCollectionScheduler:
         except Exception as e:
             logger.error(f"Super gems analysis failed: {e}")
     
+    def _transform_super_gem(self, gem):
+        """Convert a super gems JSON entry into the podcast generator format."""
+        gem_entry = {
+            'hn_id': gem.get('post_hn_id'),
+            'title': gem.get('title'),
+            'url': gem.get('url'),
+            'author': gem.get('author'),
+            'analysis': gem.get('analysis', {}),
+            'author_karma': 50,  # Default for low-karma gems
+            'badges': gem.get('badges', {})  # Include badges with GitHub stars
+        }
+        
+        # Add detailed analysis from performance indicators and other data
+        analysis = gem_entry['analysis']
+        analysis['overall_rating'] = gem.get('super_gem_score', 0)
+        analysis['detailed_analysis'] = f"This {gem.get('title', 'project')} demonstrates excellent technical merit with a super gem score of {gem.get('super_gem_score', 0):.1f}."
+        analysis['strengths'] = gem.get('strengths', ["High-quality implementation", "Innovative approach"])
+        analysis['areas_for_improvement'] = gem.get('concerns', ["Documentation could be expanded"])
+        
+        return gem_entry
+    
+    def _load_super_gems(self, super_gems_file):
+        """
+        Load and transform super gems, reusing the last result while the file is unchanged.
+        Returns None if the file does not exist.
+        """
+        try:
+            file_stat = os.stat(super_gems_file)
+        except FileNotFoundError:
+            return None
+        
+        cache_key = (os.path.abspath(super_gems_file), file_stat.st_mtime_ns, file_stat.st_size)
+        cached = self._super_gems_cache
+        if cached and cached[0] == cache_key:
+            logger.debug(f"Reusing parsed super gems from {super_gems_file}")
+            return cached[1]
+        
+        # Stream gems one at a time when ijson is available to avoid
+        # holding both the raw and the transformed list in memory
+        if ijson is not None:
+            with open(super_gems_file, 'rb') as f:
+                gems = [self._transform_super_gem(gem) for gem in ijson.items(f, 'item', use_float=True)]
+        else:
+            with open(super_gems_file, 'r') as f:
+                super_gems_data = json.load(f) or []
+            gems = [self._transform_super_gem(gem) for gem in super_gems_data]
+        
+        self._super_gems_cache = (cache_key, gems)
+        return gems
+    
     def _generate_podcast_audio(self):
         """
         Generate podcast audio from the latest super gems analysis.
         Runs within Flask app context.
         """
         try:
-            import os
-            import json
-            from datetime import datetime
             from hn_hidden_gems.services.podcast_generator import PodcastGenerator
             from hn_hidden_gems.services.audio_service import AudioService
             
@@ -652,6 +1059,10 @@ class PostCollectionScheduler:
             
             logger.info("Starting podcast audio generation...")
             
+            # One timestamp for the whole run keeps the script, file names and
+            # episode date consistent even if generation crosses midnight
+            run_started = datetime.now()
+            
             # Check for required API keys
             gemini_api_key = self.app.config.get('GEMINI_API_KEY') or os.environ.get('GEMINI_API_KEY')
             if not gemini_api_key:
@@ -660,44 +1071,43 @@ class PostCollectionScheduler:
             
             # Load super gems data
             super_gems_file = 'super-gems.json'
-            if not os.path.exists(super_gems_file):
+            gems = self._load_super_gems(super_gems_file)
+            if gems is None:
                 logger.error(f"Super gems file {super_gems_file} not found, skipping podcast generation")
                 return
             
-            with open(super_gems_file, 'r') as f:
-                super_gems_data = json.load(f)
-            
-            if not super_gems_data:
-                logger.info("No super gems data available, creating empty podcast script")
-                super_gems_data = []
-            
             # Transform data to expected format
             gems_data = {
-                'gems': [],
-                'generation_timestamp': datetime.now().isoformat(),
-                'total_analyzed': len(super_gems_data)
+                'gems': gems,
+                'generation_timestamp': run_started.isoformat(),
+                'total_analyzed': len(gems)
             }
             
-            # Convert super gems JSON to expected format
-            for gem in super_gems_data:
-                gem_entry = {
-                    'hn_id': gem.get('post_hn_id'),
-                    'title': gem.get('title'),
-                    'url': gem.get('url'),
-                    'author': gem.get('author'),
-                    'analysis': gem.get('analysis', {}),
-                    'author_karma': 50,  # Default for low-karma gems
-                    'badges': gem.get('badges', {})  # Include badges with GitHub stars
-                }
-                
-                # Add detailed analysis from performance indicators and other data
-                analysis = gem_entry['analysis']
-                analysis['overall_rating'] = gem.get('super_gem_score', 0)
-                analysis['detailed_analysis'] = f"This {gem.get('title', 'project')} demonstrates excellent technical merit with a super gem score of {gem.get('super_gem_score', 0):.1f}."
-                analysis['strengths'] = gem.get('strengths', ["High-quality implementation", "Innovative approach"])
-                analysis['areas_for_improvement'] = gem.get('concerns', ["Documentation could be expanded"])
+            if not gems:
+                logger.info("No super gems data available, creating empty podcast script")
+            
+            # Get audio storage path
+            audio_storage_path = os.environ.get('AUDIO_STORAGE_PATH', 'static/audio')
+            
+            def create_audio_service():
+                # Ensure directory exists
+                os.makedirs(audio_storage_path, exist_ok=True)
                 
-                gems_data['gems'].append(gem_entry)
+                return AudioService(
+                    credentials_path=os.environ.get('GOOGLE_TTS_CREDENTIALS_PATH'),
+                    language_code=os.environ.get('TTS_LANGUAGE_CODE', 'en-US'),
+                    voice_name=os.environ.get('TTS_VOICE_NAME', 'en-US-Neural2-J'),
+                    audio_encoding=os.environ.get('TTS_AUDIO_ENCODING', 'MP3'),
+                    audio_storage_path=audio_storage_path,
+                    api_endpoint=os.environ.get('TTS_API_ENDPOINT'),
+                    use_ssml=os.environ.get('TTS_USE_SSML', 'false').lower() == 'true'
+                )
+            
+            # Connect to TTS (gRPC channel and connection test) on a worker
+            # thread while Gemini writes the script
+            tts_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts-connect')
+            audio_service_future = tts_pool.submit(create_audio_service)
+            tts_pool.shutdown(wait=False)
             
             # Initialize podcast generator
             podcast_generator = PodcastGenerator(gemini_api_key)
@@ -713,39 +1123,25 @@ class PostCollectionScheduler:
             
             # Initialize audio service (only if Google Cloud TTS is configured)
             try:
-                # Get audio storage path
-                audio_storage_path = os.environ.get('AUDIO_STORAGE_PATH', 'static/audio')
-                
-                # Ensure directory exists
-                os.makedirs(audio_storage_path, exist_ok=True)
-                
-                # Initialize audio service
-                audio_service = AudioService(
-                    credentials_path=os.environ.get('GOOGLE_TTS_CREDENTIALS_PATH'),
-                    language_code=os.environ.get('TTS_LANGUAGE_CODE', 'en-US'),
-                    voice_name=os.environ.get('TTS_VOICE_NAME', 'en-US-Neural2-J'),
-                    audio_encoding=os.environ.get('TTS_AUDIO_ENCODING', 'MP3'),
-                    audio_storage_path=audio_storage_path
-                )
+                audio_service = audio_service_future.result()
                 
                 if not audio_service.is_available:
                     logger.warning("Google Cloud TTS not available, saving script only")
                     # Save script to file for manual processing later
-                    script_filename = f"podcast_script_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+                    script_filename = f"podcast_script_{run_started.strftime('%Y%m%d_%H%M%S')}.txt"
                     script_path = os.path.join(audio_storage_path, script_filename)
-                    with open(script_path, 'w', encoding='utf-8') as f:
-                        f.write(script_data['script'])
+                    _write_text_atomic(script_path, script_data['script'])
                     logger.info(f"Saved podcast script to {script_path}")
                     return
                 
                 # Generate audio
-                date_str = datetime.now().strftime('%Y-%m-%d')
-                result = audio_service.generate_podcast_audio(script_data, date_str)
+                date_str = run_started.strftime('%Y-%m-%d')
+                result = audio_service.generate_podcast_audio_streaming(script_data, date_str)
                 
                 if result['success']:
                     logger.info(f"Podcast audio generated successfully: {result['audio_path']}")
                     if result.get('cached'):
-                        logger.info("Used cached audio file (less than 24 hours old)")
+                        logger.info("Reused audio generated from an identical script")
                     else:
                         file_size_mb = result['metadata']['file_size_bytes'] / (1024 * 1024)
                         duration_min = result['metadata']['estimated_duration_minutes']
@@ -758,47 +1154,57 @@ class PostCollectionScheduler:
                         
                         audio_path = Path(result['audio_path'])
                         
-                        # Check if this audio metadata already exists (prevent duplicates)
-                        existing = AudioMetadata.query.filter_by(filename=audio_path.name).first()
-                        if existing:
-                            # Update existing record
-                            existing.generation_timestamp = datetime.now()
-                            existing.generation_status = 'completed'
-                            existing.file_size_bytes = result['metadata'].get('file_size_bytes', 0)
-                            existing.actual_duration_seconds = result['metadata'].get('estimated_duration_minutes', 0) * 60
-                            existing.gems_count = result['metadata'].get('gems_count', 0)
-                            existing.estimated_duration_minutes = result['metadata'].get('estimated_duration_minutes', 0)
-                            logger.info(f"Updated existing audio metadata: {existing.filename}")
-                        else:
-                            # Create new record
-                            audio_metadata = AudioMetadata(
-                                filename=audio_path.name,
-                                file_path=str(audio_path),
-                                script_source='super-gems',
-                                generation_timestamp=datetime.now(),
-                                generation_status='completed',
-                                file_size_bytes=result['metadata'].get('file_size_bytes', 0),
-                                actual_duration_seconds=result['metadata'].get('estimated_duration_minutes', 0) * 60,
-                                estimated_duration_minutes=result['metadata'].get('estimated_duration_minutes', 0),
-                                gems_count=result['metadata'].get('gems_count', 0),
-                                voice_name=result['metadata'].get('voice_name', 'en-GB-Standard-B'),
-                                language_code=result['metadata'].get('language_code', 'en-US')
-                            )
-                            db.session.add(audio_metadata)
-                            logger.info(f"Created new audio metadata: {audio_metadata.filename}")
+                        # Prefer the duration measured from the audio over the estimate
+                        actual_duration_seconds = (
+                            result['metadata'].get('actual_duration_seconds')
+                            or result['metadata'].get('estimated_duration_minutes', 0) * 60
+                        )
+                        
+                        # Insert or refresh the row for this file in one statement
+                        AudioMetadata.upsert({
+                            'filename': audio_path.name,
+                            'file_path': str(audio_path),
+                            'script_source': 'super-gems',
+                            'generation_timestamp': datetime.now(),
+                            'generation_status': 'completed',
+                            'file_size_bytes': result['metadata'].get('file_size_bytes', 0),
+                            'actual_duration_seconds': actual_duration_seconds,
+                            'estimated_duration_minutes': result['metadata'].get('estimated_duration_minutes', 0),
+                            'gems_count': result['metadata'].get('gems_count', 0),
+                            'voice_name': result['metadata'].get('voice_name', 'en-GB-Standard-B'),
+                            'language_code': result['metadata'].get('language_code', 'en-US'),
+                            'audio_encoding': result['metadata'].get('audio_encoding', 'MP3')
+                        }, update_columns=[
+                            'generation_timestamp', 'generation_status', 'file_size_bytes',
+                            'actual_duration_seconds', 'gems_count', 'estimated_duration_minutes',
+                            'audio_encoding'
+                        ])
                         
                         db.session.commit()
+                        logger.info(f"Saved audio metadata: {audio_path.name}")
                         
                     except Exception as e:
                         logger.error(f"Failed to save audio metadata to database: {e}")
                         try:
-                            db.session.rollback()
+                            _rollback_if_needed()
                         except:
                             pass
                     
-                    # Clean up old files
+                    # Clean up old files on the io pool so the directory scan and
+                    # unlinks don't hold up this job
                     cleanup_days = int(os.environ.get('AUDIO_CLEANUP_DAYS', 30))
-                    audio_service.cleanup_old_files(max_age_days=cleanup_days)
+                    if self.is_running():
+                        self.scheduler.add_job(
+                            func=audio_service.cleanup_old_files,
+                            kwargs={'max_age_days': cleanup_days},
+                            id='audio_cleanup',
+                            name='Clean up old podcast audio files',
+                            executor='io',
+                            replace_existing=True
+                        )
+                    else:
+                        # Called from the CLI without a running scheduler
+                        audio_service.cleanup_old_files(max_age_days=cleanup_days)
                     
                 else:
                     logger.error(f"Failed to generate podcast audio: {result.get('error', 'Unknown error')}")
@@ -806,10 +1212,9 @@ class PostCollectionScheduler:
             except Exception as audio_error:
                 logger.error(f"Audio generation failed: {audio_error}")
                 # Still save the script for manual processing
-                script_filename = f"podcast_script_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+                script_filename = f"podcast_script_{run_started.strftime('%Y%m%d_%H%M%S')}.txt"
                 try:
-                    with open(script_filename, 'w', encoding='utf-8') as f:
-                        f.write(script_data['script'])
+                    _write_text_atomic(script_filename, script_data['script'])
                     logger.info(f"Saved podcast script to {script_filename} for manual processing")
                 except Exception as save_error:
                     logger.error(f"Failed to save podcast script: {save_error}")
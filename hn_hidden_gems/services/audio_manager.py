@@ -1,18 +1,36 @@
 import os
-import json
+import copy
+import time
+import asyncio
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Literal, Optional, Any
 from datetime import datetime, timedelta
+from sqlalchemy import extract, func
 from hn_hidden_gems.models import AudioMetadata, PodcastScript, db
-from hn_hidden_gems.services.podcast_generator import PodcastGenerator
-from hn_hidden_gems.services.audio_service import AudioService
+from hn_hidden_gems.services.audio_service import AudioService, replace_symlink, write_latest_pointer
 
 class AudioManager:
     """
     High-level manager for audio file operations, cleanup, and organization
     """
     
+    # Worker threads for filesystem calls during cleanup
+    CLEANUP_WORKERS = 16
+    
+    # IDs per DELETE ... IN (...) statement, below SQLite's bound parameter limit
+    DELETE_BATCH_SIZE = 500
+    
+    # Seconds get_storage_stats results are reused for
+    STATS_TTL = 60
+    
+    # Podcasts saved per commit by generate_complete_podcasts_batch
+    COMMIT_BATCH_SIZE = 20
+    
+    # Extensions of stored audio files (MP3, or Ogg Opus when configured)
+    AUDIO_SUFFIXES = ('.mp3', '.ogg')
+    
     def __init__(self, 
                  audio_storage_path: str = "static/audio",
                  gemini_api_key: Optional[str] = None):
@@ -26,20 +44,38 @@ class AudioManager:
         self.audio_storage_path = Path(audio_storage_path)
         self.audio_storage_path.mkdir(parents=True, exist_ok=True)
         
-        # Initialize services
-        self.podcast_generator = PodcastGenerator(gemini_api_key) if gemini_api_key else None
-        self.audio_service = AudioService(audio_storage_path=str(audio_storage_path))
+        # Initialize services; the Gemini SDK is only imported when it is needed
+        self.podcast_generator = None
+        if gemini_api_key:
+            from hn_hidden_gems.services.podcast_generator import PodcastGenerator
+            self.podcast_generator = PodcastGenerator(gemini_api_key)
+        # Same TTS settings as the scheduler, so a streamable voice is streamed here too
+        self.audio_service = AudioService(
+            credentials_path=os.environ.get('GOOGLE_TTS_CREDENTIALS_PATH'),
+            language_code=os.environ.get('TTS_LANGUAGE_CODE', 'en-US'),
+            voice_name=os.environ.get('TTS_VOICE_NAME', 'en-US-Neural2-J'),
+            audio_encoding=os.environ.get('TTS_AUDIO_ENCODING', 'MP3'),
+            audio_storage_path=str(audio_storage_path),
+            api_endpoint=os.environ.get('TTS_API_ENDPOINT'),
+            use_ssml=os.environ.get('TTS_USE_SSML', 'false').lower() == 'true'
+        )
         
         self.logger = logging.getLogger(__name__)
+        
+        # (deep, detail) -> (computed at, stats) for get_storage_stats
+        self._stats_cache = {}
     
     def generate_complete_podcast(self, super_gems_data: Dict[str, Any], 
-                                save_to_db: bool = True) -> Dict[str, Any]:
+                                save_to_db: bool = True,
+                                defer_commit: bool = False) -> Dict[str, Any]:
         """
         Complete podcast generation pipeline: script + audio + database
         
         Args:
             super_gems_data: Dictionary with gems and metadata
             save_to_db: Whether to save metadata to database
+            defer_commit: Leave the database rows flushed but uncommitted, for
+                          callers that commit several podcasts at once
             
         Returns:
             Dictionary with generation results
@@ -61,77 +97,199 @@ class AudioManager:
                     "error": "Failed to generate podcast script"
                 }
             
-            # Step 2: Save script to database if requested
-            podcast_script = None
-            if save_to_db:
-                try:
-                    podcast_script = PodcastScript.create_from_generator_output(
-                        script_data, 'super-gems'
-                    )
-                    db.session.commit()
-                    self.logger.info(f"Saved podcast script to database: {podcast_script.id}")
-                except Exception as e:
-                    self.logger.error(f"Failed to save script to database: {e}")
-                    db.session.rollback()
-            
-            # Step 3: Generate audio
+            # Step 2: Generate audio
             self.logger.info("Generating audio from script...")
             date_str = datetime.now().strftime('%Y-%m-%d')
-            audio_result = self.audio_service.generate_podcast_audio(script_data, date_str)
+            audio_result = self.audio_service.generate_podcast_audio_streaming(script_data, date_str)
             
-            if not audio_result['success']:
-                return {
-                    "success": False,
-                    "error": f"Audio generation failed: {audio_result.get('error', 'Unknown error')}",
-                    "script_generated": True,
-                    "script_data": script_data
-                }
-            
-            # Step 4: Save audio metadata to database if requested
-            audio_metadata = None
-            if save_to_db and audio_result['success']:
-                try:
-                    # Create audio metadata entry
-                    metadata_dict = audio_result['metadata'].copy()
-                    metadata_dict['script_source'] = 'super-gems'
-                    
-                    audio_metadata = AudioMetadata.create_entry(
-                        filename=Path(audio_result['audio_path']).name,
-                        file_path=audio_result['audio_path'],
-                        metadata_dict=metadata_dict
-                    )
-                    
-                    # Link script and audio if both exist
-                    if podcast_script:
-                        podcast_script.mark_audio_generated(audio_metadata)
-                    
-                    db.session.commit()
-                    self.logger.info(f"Saved audio metadata to database: {audio_metadata.id}")
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to save audio metadata to database: {e}")
-                    db.session.rollback()
+            # Step 3: Save script and audio metadata to database if requested.
+            # Done after synthesis so no write transaction stays open meanwhile
+            return self._finish_podcast(script_data, audio_result, save_to_db, defer_commit)
             
+        except Exception as e:
+            self.logger.error(f"Complete podcast generation failed: {e}")
             return {
-                "success": True,
-                "script_data": script_data,
-                "audio_path": audio_result['audio_path'],
-                "metadata_path": audio_result.get('metadata_path'),
-                "cached": audio_result.get('cached', False),
-                "database_entries": {
-                    "script_id": podcast_script.id if podcast_script else None,
-                    "audio_id": audio_metadata.id if audio_metadata else None
-                },
-                "file_size_mb": audio_result['metadata']['file_size_bytes'] / (1024 * 1024),
-                "estimated_duration_minutes": audio_result['metadata']['estimated_duration_minutes']
+                "success": False,
+                "error": str(e)
             }
+    
+    async def generate_complete_podcasts_batch(self, super_gems_datas: List[Dict[str, Any]],
+                                               save_to_db: bool = True,
+                                               max_concurrent: int = 5) -> List[Dict[str, Any]]:
+        """
+        Run the complete podcast pipeline for several inputs concurrently
+        
+        Script and audio generation run in worker threads, at most max_concurrent
+        podcasts at a time. Database writes happen afterwards on the calling
+        thread so the Flask-SQLAlchemy session is never shared between threads.
+        
+        Args:
+            super_gems_datas: List of super gems dictionaries, one per podcast
+            save_to_db: Whether to save metadata to database
+            max_concurrent: Maximum number of podcasts generated at once
+            
+        Returns:
+            List of generation results in the same order as the input
+        """
+        if not self.podcast_generator:
+            return [{
+                "success": False,
+                "error": "Podcast generator not initialized (missing Gemini API key)"
+            } for _ in super_gems_datas]
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def generate_limited(super_gems_data):
+            async with semaphore:
+                return await self._generate_one(super_gems_data)
+        
+        tasks = [asyncio.create_task(generate_limited(data)) for data in super_gems_datas]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        results = []
+        for index, outcome in enumerate(outcomes):
+            if save_to_db and index and index % self.COMMIT_BATCH_SIZE == 0:
+                self._commit()
+            
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Complete podcast generation failed: {outcome}")
+                results.append({"success": False, "error": str(outcome)})
+                continue
             
+            script_data, audio_result = outcome
+            if not script_data or not script_data.get('script'):
+                results.append({
+                    "success": False,
+                    "error": "Failed to generate podcast script"
+                })
+                continue
+            
+            try:
+                results.append(self._finish_podcast(script_data, audio_result, save_to_db,
+                                                    defer_commit=True))
+            except Exception as e:
+                self.logger.error(f"Complete podcast generation failed: {e}")
+                results.append({"success": False, "error": str(e)})
+        
+        if save_to_db:
+            self._commit()
+        
+        return results
+    
+    async def _generate_one(self, super_gems_data: Dict[str, Any]):
+        """Generate script and audio for one podcast without touching the database"""
+        script_data = await asyncio.to_thread(
+            self.podcast_generator.generate_podcast_script, super_gems_data
+        )
+        if not script_data or not script_data.get('script'):
+            return script_data, None
+        
+        # Name the file after the data's own date so a batch covering several
+        # days doesn't write every podcast to today's filename
+        date_str = datetime.now().strftime('%Y-%m-%d')
+        timestamp = super_gems_data.get('generation_timestamp')
+        if timestamp:
+            try:
+                date_str = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+            except (AttributeError, ValueError):
+                pass
+        
+        audio_result = await asyncio.to_thread(
+            self.audio_service.generate_podcast_audio_streaming, script_data, date_str
+        )
+        return script_data, audio_result
+    
+    def _commit(self) -> bool:
+        """Commit pending podcast rows, rolling back on failure"""
+        try:
+            db.session.commit()
+            return True
         except Exception as e:
-            self.logger.error(f"Complete podcast generation failed: {e}")
+            self.logger.error(f"Failed to commit podcast metadata: {e}")
+            db.session.rollback()
+            return False
+    
+    def _save_script(self, script_data: Dict[str, Any]) -> Optional[PodcastScript]:
+        """Flush a generated script in a savepoint, returning None on failure"""
+        try:
+            with db.session.begin_nested():
+                podcast_script = PodcastScript.create_from_generator_output(
+                    script_data, 'super-gems'
+                )
+            self.logger.info(f"Saved podcast script to database: {podcast_script.id}")
+            return podcast_script
+        except Exception as e:
+            self.logger.error(f"Failed to save script to database: {e}")
+            return None
+    
+    def _save_audio_metadata(self, audio_result: Dict[str, Any],
+                             podcast_script: Optional[PodcastScript]) -> Optional[AudioMetadata]:
+        """Flush an audio metadata entry in a savepoint, returning None on failure"""
+        try:
+            with db.session.begin_nested():
+                # Create audio metadata entry
+                metadata_dict = audio_result['metadata'].copy()
+                metadata_dict['script_source'] = 'super-gems'
+                
+                audio_metadata = AudioMetadata.create_entry(
+                    filename=Path(audio_result['audio_path']).name,
+                    file_path=audio_result['audio_path'],
+                    metadata_dict=metadata_dict
+                )
+                
+                # Link script and audio if both exist
+                if podcast_script:
+                    podcast_script.mark_audio_generated(audio_metadata, commit=False)
+            
+            self.logger.info(f"Saved audio metadata to database: {audio_metadata.id}")
+            return audio_metadata
+        except Exception as e:
+            self.logger.error(f"Failed to save audio metadata to database: {e}")
+            return None
+    
+    def _finish_podcast(self, script_data: Dict[str, Any], audio_result: Dict[str, Any],
+                        save_to_db: bool, defer_commit: bool = False) -> Dict[str, Any]:
+        """Save script and audio metadata if requested and build the pipeline result"""
+        script_id = None
+        audio_id = None
+        
+        if save_to_db:
+            # Each row gets its own savepoint so one failure doesn't discard the rest
+            podcast_script = self._save_script(script_data)
+            audio_metadata = None
+            if audio_result['success']:
+                audio_metadata = self._save_audio_metadata(audio_result, podcast_script)
+            
+            script_id = podcast_script.id if podcast_script else None
+            audio_id = audio_metadata.id if audio_metadata else None
+            
+            if not defer_commit and not self._commit():
+                script_id = audio_id = None
+        
+        if not audio_result['success']:
             return {
                 "success": False,
-                "error": str(e)
+                "error": f"Audio generation failed: {audio_result.get('error', 'Unknown error')}",
+                "script_generated": True,
+                "script_data": script_data
             }
+        
+        # A new audio file changes the storage stats
+        self._stats_cache.clear()
+        
+        return {
+            "success": True,
+            "script_data": script_data,
+            "audio_path": audio_result['audio_path'],
+            "metadata_path": audio_result.get('metadata_path'),
+            "cached": audio_result.get('cached', False),
+            "database_entries": {
+                "script_id": script_id,
+                "audio_id": audio_id
+            },
+            "file_size_mb": audio_result['metadata']['file_size_bytes'] / (1024 * 1024),
+            "estimated_duration_minutes": audio_result['metadata']['estimated_duration_minutes']
+        }
     
     def cleanup_old_files(self, max_age_days: int = 30, dry_run: bool = False) -> Dict[str, Any]:
         """
@@ -145,6 +303,7 @@ class AudioManager:
             Dictionary with cleanup results
         """
         cutoff_time = datetime.now() - timedelta(days=max_age_days)
+        cutoff_ts = cutoff_time.timestamp()
         results = {
             "files_deleted": 0,
             "files_size_freed": 0,
@@ -155,64 +314,66 @@ class AudioManager:
         
         try:
             # Find old audio metadata entries
-            old_audio_entries = AudioMetadata.query.filter(
+            # Only the columns cleanup needs, as plain rows rather than ORM objects
+            old_audio_entries = db.session.query(
+                AudioMetadata.id, AudioMetadata.file_path, AudioMetadata.filename
+            ).filter(
                 AudioMetadata.generation_timestamp < cutoff_time
             ).all()
             
-            for audio_entry in old_audio_entries:
-                try:
-                    # Check if file exists and get size
-                    file_path = Path(audio_entry.file_path)
-                    file_size = 0
-                    
-                    if file_path.exists():
-                        file_size = file_path.stat().st_size
-                        results["files_size_freed"] += file_size
-                        
-                        if not dry_run:
-                            file_path.unlink()
-                            self.logger.info(f"Deleted old audio file: {file_path}")
-                    
-                    # Also delete metadata file if it exists
-                    metadata_file = file_path.with_suffix('_metadata.json')
-                    if metadata_file.exists() and not dry_run:
-                        metadata_file.unlink()
-                    
-                    # Remove database entry
-                    if not dry_run:
-                        db.session.delete(audio_entry)
-                        results["db_entries_cleaned"] += 1
-                    
-                    results["files_deleted"] += 1
-                    
-                except Exception as e:
-                    error_msg = f"Error cleaning up {audio_entry.filename}: {e}"
+            # Filesystem work runs on the pool; the session stays on this thread
+            entry_paths = [Path(entry.file_path) for entry in old_audio_entries]
+            with ThreadPoolExecutor(max_workers=self.CLEANUP_WORKERS) as executor:
+                pruned = list(executor.map(
+                    lambda file_path: self._prune_audio_file(file_path, dry_run, with_metadata=True),
+                    entry_paths
+                ))
+            
+            ids_to_delete = []
+            for audio_entry, (file_size, error) in zip(old_audio_entries, pruned):
+                if error:
+                    error_msg = f"Error cleaning up {audio_entry.filename}: {error}"
                     self.logger.error(error_msg)
                     results["errors"].append(error_msg)
+                    continue
+                
+                results["files_size_freed"] += file_size
+                ids_to_delete.append(audio_entry.id)
+                results["files_deleted"] += 1
             
-            # Commit database changes
-            if not dry_run and results["db_entries_cleaned"] > 0:
+            # Remove database entries
+            if not dry_run and ids_to_delete:
+                self._delete_audio_entries(ids_to_delete)
                 db.session.commit()
+                results["db_entries_cleaned"] = len(ids_to_delete)
             
             # Clean up orphaned files (files without database entries)
             if self.audio_storage_path.exists():
-                for file_path in self.audio_storage_path.glob("*.mp3"):
-                    # Skip symlinks (like latest.mp3)
-                    if file_path.is_symlink():
-                        continue
-                    
-                    # Check if this file has a database entry
-                    audio_entry = AudioMetadata.find_by_filename(file_path.name)
-                    if not audio_entry and file_path.stat().st_mtime < cutoff_time.timestamp():
-                        file_size = file_path.stat().st_size
+                known_filenames = AudioMetadata.get_all_filenames()
+                
+                orphan_paths = [
+                    Path(entry.path) for entry in self._iter_audio_files()
+                    if entry.name not in known_filenames
+                ]
+                
+                with ThreadPoolExecutor(max_workers=self.CLEANUP_WORKERS) as executor:
+                    pruned = list(executor.map(
+                        lambda file_path: self._prune_audio_file(file_path, dry_run, older_than=cutoff_ts),
+                        orphan_paths
+                    ))
+                
+                for file_path, (file_size, error) in zip(orphan_paths, pruned):
+                    if error:
+                        error_msg = f"Error cleaning up {file_path.name}: {error}"
+                        self.logger.error(error_msg)
+                        results["errors"].append(error_msg)
+                    elif file_size is not None:
                         results["files_size_freed"] += file_size
-                        
-                        if not dry_run:
-                            file_path.unlink()
-                            self.logger.info(f"Deleted orphaned audio file: {file_path}")
-                        
                         results["files_deleted"] += 1
             
+            if not dry_run:
+                self._stats_cache.clear()
+            
             self.logger.info(f"Cleanup completed: {results['files_deleted']} files, "
                            f"{results['files_size_freed'] / (1024*1024):.1f}MB freed, "
                            f"{results['db_entries_cleaned']} DB entries")
@@ -226,13 +387,92 @@ class AudioManager:
         
         return results
     
-    def get_storage_stats(self) -> Dict[str, Any]:
+    def _delete_audio_entries(self, ids: List[int]):
+        """Bulk-delete audio metadata rows, unlinking any scripts that point at them"""
+        for start in range(0, len(ids), self.DELETE_BATCH_SIZE):
+            batch = ids[start:start + self.DELETE_BATCH_SIZE]
+            
+            # Same as the ORM delete, which nulls the backref foreign key
+            PodcastScript.query.filter(
+                PodcastScript.audio_metadata_id.in_(batch)
+            ).update({PodcastScript.audio_metadata_id: None}, synchronize_session=False)
+            
+            AudioMetadata.query.filter(
+                AudioMetadata.id.in_(batch)
+            ).delete(synchronize_session=False)
+    
+    def _iter_audio_files(self):
+        """Yield os.DirEntry objects for stored audio files, skipping symlinks like latest.mp3"""
+        with os.scandir(self.audio_storage_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.AUDIO_SUFFIXES) and not entry.is_symlink():
+                    yield entry
+    
+    def _prune_audio_file(self, file_path: Path, dry_run: bool, with_metadata: bool = False,
+                          older_than: Optional[float] = None):
+        """
+        Delete one audio file; touches only the filesystem so it can run on a worker thread
+        
+        Args:
+            file_path: Audio file to delete
+            dry_run: If True, only measure the file
+            with_metadata: Also delete the file's _metadata.json sidecar
+            older_than: Only delete if the file's mtime is before this timestamp
+            
+        Returns:
+            (size in bytes, error) - size is None if the file was skipped for being too new
+        """
+        file_size = 0
+        error = None
+        
+        try:
+            try:
+                file_stat = file_path.stat()
+            except FileNotFoundError:
+                file_stat = None
+            
+            if file_stat is not None:
+                if older_than is not None and file_stat.st_mtime >= older_than:
+                    return None, None
+                
+                file_size = file_stat.st_size
+                if not dry_run:
+                    file_path.unlink()
+                    self.logger.info(f"Deleted audio file: {file_path}")
+        except Exception as e:
+            file_size, error = 0, e
+        
+        # Also delete metadata file, even if the audio file couldn't be removed
+        if with_metadata and not dry_run:
+            try:
+                file_path.with_name(f"{file_path.stem}_metadata.json").unlink(missing_ok=True)
+            except Exception as e:
+                error = error or e
+        
+        return file_size, error
+    
+    def get_storage_stats(self, deep: bool = False,
+                          detail: Literal['summary', 'full'] = 'full') -> Dict[str, Any]:
         """
         Get storage statistics for audio files
         
+        Args:
+            deep: If True, compute totals by scanning the files on disk instead
+                  of aggregating the database entries
+            detail: 'summary' returns only file count, total size and database
+                    entries, skipping the per-month histogram and date range
+        
         Returns:
             Dictionary with storage stats
         """
+        cache_key = (deep, detail)
+        cached = self._stats_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.STATS_TTL:
+            return copy.deepcopy(cached[1])
+        
+        if detail == 'summary':
+            return self._get_storage_summary(deep, cache_key)
+        
         stats = {
             "total_files": 0,
             "total_size_bytes": 0,
@@ -244,34 +484,11 @@ class AudioManager:
         }
         
         try:
-            # Database statistics
-            stats["database_entries"] = AudioMetadata.query.count()
-            
-            # File system statistics
-            if self.audio_storage_path.exists():
-                for file_path in self.audio_storage_path.glob("*.mp3"):
-                    if file_path.is_symlink():
-                        continue
-                    
-                    file_stat = file_path.stat()
-                    stats["total_files"] += 1
-                    stats["total_size_bytes"] += file_stat.st_size
-                    
-                    file_date = datetime.fromtimestamp(file_stat.st_mtime)
-                    month_key = file_date.strftime("%Y-%m")
-                    
-                    if month_key not in stats["audio_by_month"]:
-                        stats["audio_by_month"][month_key] = {"count": 0, "size_bytes": 0}
-                    
-                    stats["audio_by_month"][month_key]["count"] += 1
-                    stats["audio_by_month"][month_key]["size_bytes"] += file_stat.st_size
-                    
-                    # Track oldest/newest
-                    if stats["oldest_file"] is None or file_date < stats["oldest_file"]:
-                        stats["oldest_file"] = file_date
-                    
-                    if stats["newest_file"] is None or file_date > stats["newest_file"]:
-                        stats["newest_file"] = file_date
+            if deep:
+                stats["database_entries"] = db.session.query(func.count(AudioMetadata.id)).scalar()
+                self._collect_file_stats(stats)
+            else:
+                self._collect_db_stats(stats)
             
             stats["total_size_mb"] = stats["total_size_bytes"] / (1024 * 1024)
             
@@ -281,12 +498,102 @@ class AudioManager:
             if stats["newest_file"]:
                 stats["newest_file"] = stats["newest_file"].isoformat()
             
+            self._stats_cache[cache_key] = (time.monotonic(), copy.deepcopy(stats))
+            
         except Exception as e:
             self.logger.error(f"Error getting storage stats: {e}")
             stats["error"] = str(e)
         
         return stats
     
+    def _get_storage_summary(self, deep: bool, cache_key) -> Dict[str, Any]:
+        """Totals-only variant of get_storage_stats"""
+        stats = {
+            "total_files": 0,
+            "total_size_bytes": 0,
+            "total_size_mb": 0,
+            "database_entries": 0
+        }
+        
+        try:
+            database_entries, size_bytes = db.session.query(
+                func.count(AudioMetadata.id),
+                func.coalesce(func.sum(AudioMetadata.file_size_bytes), 0)
+            ).one()
+            stats["database_entries"] = database_entries
+            
+            if deep:
+                if self.audio_storage_path.exists():
+                    for entry in self._iter_audio_files():
+                        stats["total_files"] += 1
+                        stats["total_size_bytes"] += entry.stat(follow_symlinks=False).st_size
+            else:
+                stats["total_files"] = database_entries
+                stats["total_size_bytes"] = int(size_bytes)
+            
+            stats["total_size_mb"] = stats["total_size_bytes"] / (1024 * 1024)
+            self._stats_cache[cache_key] = (time.monotonic(), dict(stats))
+            
+        except Exception as e:
+            self.logger.error(f"Error getting storage stats: {e}")
+            stats["error"] = str(e)
+        
+        return stats
+    
+    def _collect_db_stats(self, stats: Dict[str, Any]):
+        """Fill storage stats from one aggregate query over the audio metadata"""
+        year = extract('year', AudioMetadata.generation_timestamp)
+        month = extract('month', AudioMetadata.generation_timestamp)
+        
+        rows = db.session.query(
+            year, month,
+            func.count(AudioMetadata.id),
+            func.coalesce(func.sum(AudioMetadata.file_size_bytes), 0),
+            func.min(AudioMetadata.generation_timestamp),
+            func.max(AudioMetadata.generation_timestamp)
+        ).group_by(year, month).all()
+        
+        for row_year, row_month, count, size_bytes, oldest, newest in rows:
+            month_key = f"{int(row_year):04d}-{int(row_month):02d}"
+            stats["audio_by_month"][month_key] = {"count": count, "size_bytes": int(size_bytes)}
+            
+            stats["database_entries"] += count
+            stats["total_files"] += count
+            stats["total_size_bytes"] += int(size_bytes)
+            
+            # Track oldest/newest
+            if stats["oldest_file"] is None or oldest < stats["oldest_file"]:
+                stats["oldest_file"] = oldest
+            
+            if stats["newest_file"] is None or newest > stats["newest_file"]:
+                stats["newest_file"] = newest
+    
+    def _collect_file_stats(self, stats: Dict[str, Any]):
+        """Fill storage stats by scanning the audio files on disk"""
+        if not self.audio_storage_path.exists():
+            return
+        
+        for entry in self._iter_audio_files():
+            file_stat = entry.stat(follow_symlinks=False)
+            stats["total_files"] += 1
+            stats["total_size_bytes"] += file_stat.st_size
+            
+            file_date = datetime.fromtimestamp(file_stat.st_mtime)
+            month_key = file_date.strftime("%Y-%m")
+            
+            if month_key not in stats["audio_by_month"]:
+                stats["audio_by_month"][month_key] = {"count": 0, "size_bytes": 0}
+            
+            stats["audio_by_month"][month_key]["count"] += 1
+            stats["audio_by_month"][month_key]["size_bytes"] += file_stat.st_size
+            
+            # Track oldest/newest
+            if stats["oldest_file"] is None or file_date < stats["oldest_file"]:
+                stats["oldest_file"] = file_date
+            
+            if stats["newest_file"] is None or file_date > stats["newest_file"]:
+                stats["newest_file"] = file_date
+    
     def verify_audio_integrity(self) -> Dict[str, Any]:
         """
         Verify integrity of audio files and database consistency
@@ -305,49 +612,52 @@ class AudioManager:
         
         try:
             # Check database entries for missing files
-            audio_entries = AudioMetadata.query.all()
+            audio_entries = db.session.query(
+                AudioMetadata.id, AudioMetadata.file_path,
+                AudioMetadata.filename, AudioMetadata.file_size_bytes
+            ).yield_per(500)
+            known_filenames = set()
             
             for entry in audio_entries:
                 results["total_checked"] += 1
+                known_filenames.add(entry.filename)
                 file_path = Path(entry.file_path)
                 
-                if not file_path.exists():
+                # Basic file integrity check; one stat() covers the existence check
+                try:
+                    file_size = file_path.stat().st_size
+                except FileNotFoundError:
                     results["missing_files"].append({
                         "id": entry.id,
                         "filename": entry.filename,
                         "path": str(file_path)
                     })
+                    continue
+                except Exception as e:
+                    results["corrupted_files"].append({
+                        "id": entry.id,
+                        "filename": entry.filename,
+                        "error": str(e)
+                    })
+                    continue
+                
+                if entry.file_size_bytes and abs(file_size - entry.file_size_bytes) > 1024:
+                    results["database_inconsistencies"].append({
+                        "id": entry.id,
+                        "filename": entry.filename,
+                        "issue": f"File size mismatch: DB={entry.file_size_bytes}, Actual={file_size}"
+                    })
                 else:
-                    # Basic file integrity check
-                    try:
-                        file_size = file_path.stat().st_size
-                        if entry.file_size_bytes and abs(file_size - entry.file_size_bytes) > 1024:
-                            results["database_inconsistencies"].append({
-                                "id": entry.id,
-                                "filename": entry.filename,
-                                "issue": f"File size mismatch: DB={entry.file_size_bytes}, Actual={file_size}"
-                            })
-                        else:
-                            results["healthy_files"] += 1
-                    except Exception as e:
-                        results["corrupted_files"].append({
-                            "id": entry.id,
-                            "filename": entry.filename,
-                            "error": str(e)
-                        })
+                    results["healthy_files"] += 1
             
             # Check for orphaned files
             if self.audio_storage_path.exists():
-                for file_path in self.audio_storage_path.glob("*.mp3"):
-                    if file_path.is_symlink():
-                        continue
-                    
-                    audio_entry = AudioMetadata.find_by_filename(file_path.name)
-                    if not audio_entry:
+                for entry in self._iter_audio_files():
+                    if entry.name not in known_filenames:
                         results["orphaned_files"].append({
-                            "filename": file_path.name,
-                            "path": str(file_path),
-                            "size": file_path.stat().st_size
+                            "filename": entry.name,
+                            "path": entry.path,
+                            "size": entry.stat(follow_symlinks=False).st_size
                         })
             
         except Exception as e:
@@ -358,7 +668,7 @@ class AudioManager:
     
     def regenerate_symlinks(self) -> Dict[str, Any]:
         """
-        Regenerate symlinks for latest audio files
+        Regenerate symlinks for latest audio files and the latest.txt pointer
         
         Returns:
             Dictionary with regeneration results
@@ -366,6 +676,7 @@ class AudioManager:
         results = {
             "symlinks_created": 0,
             "symlinks_updated": 0,
+            "pointer_updated": False,
             "errors": []
         }
         
@@ -374,19 +685,18 @@ class AudioManager:
             latest_audio = AudioMetadata.find_latest('super-gems')
             
             if latest_audio:
-                latest_link = self.audio_storage_path / "latest.mp3"
                 audio_file = Path(latest_audio.file_path)
+                latest_link = self.audio_storage_path / f"latest{audio_file.suffix}"
                 
-                # Remove existing symlink
-                if latest_link.exists() or latest_link.is_symlink():
-                    latest_link.unlink()
+                # Swap the symlink atomically so the latest link never goes missing
+                if replace_symlink(latest_link, audio_file.name):
                     results["symlinks_updated"] += 1
                 else:
                     results["symlinks_created"] += 1
                 
-                # Create new symlink
-                latest_link.symlink_to(audio_file.name)
                 self.logger.info(f"Created symlink: {latest_link} -> {audio_file.name}")
+                
+                results["pointer_updated"] = write_latest_pointer(self.audio_storage_path, audio_file.name)
             
         except Exception as e:
             error_msg = f"Error regenerating symlinks: {e}"
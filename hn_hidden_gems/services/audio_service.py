@@ -1,25 +1,345 @@
 import os
+import io
 import json
+import mmap
+import re
+import time
+import wave
+import random
+import shutil
+import asyncio
 import logging
+import subprocess
+import grpc
 from pathlib import Path
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from google.api_core import exceptions as google_exceptions
 from google.cloud import texttospeech
 from google.oauth2 import service_account
 import hashlib
+from xml.sax.saxutils import escape as xml_escape
 import tempfile
+import threading
+
+from hn_hidden_gems.utils.ttl_cache import TTLCache
+
+try:
+    import orjson  # Optional: faster metadata encoding and parsing
+except ImportError:
+    orjson = None
+
+def _temp_path(path: Path) -> Path:
+    """Hidden sibling of path to write to before renaming it into place"""
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+@contextmanager
+def _atomic_output(path: Path):
+    """
+    Yield a temporary path that replaces path once the block succeeds
+    
+    Readers see either the old file or the complete new one, and a failed
+    write leaves nothing behind.
+    """
+    tmp_path = _temp_path(path)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+_UNAVAILABLE_ERROR = "Google Cloud TTS service is not available"
+_INVALID_SCRIPT_ERROR = "Invalid podcast script data"
+
+def _failure_result(error: str) -> Dict[str, Any]:
+    """Result dictionary returned when audio generation fails"""
+    return {
+        "success": False,
+        "error": error,
+        "audio_path": None,
+        "metadata_path": None
+    }
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    """
+    Write data (e.g. an audio metadata sidecar) as compact JSON with a single write
+    
+    The file is replaced atomically, so the cache lookups reading it never see
+    a partial document.
+    """
+    if orjson is not None:
+        encoded = orjson.dumps(data)
+    else:
+        # json.dumps uses the C encoder; json.dump encodes piecewise in Python
+        encoded = json.dumps(data, separators=(",", ":")).encode('utf-8')
+    
+    with _atomic_output(path) as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded)
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    """Parse a JSON file written by _write_json; raises OSError or ValueError"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def replace_symlink(link_path: Path, target: str) -> bool:
+    """
+    Point link_path at target atomically
+    
+    The new link is created under a temporary name and renamed over the old
+    one, so readers never see link_path missing.
+    
+    Returns:
+        True if an existing link was replaced
+    """
+    existed = os.path.lexists(link_path)
+    tmp_path = _temp_path(link_path)
+    try:
+        tmp_path.unlink()
+    except FileNotFoundError:
+        pass
+    tmp_path.symlink_to(target)
+    try:
+        os.replace(tmp_path, link_path)
+    except BaseException:
+        tmp_path.unlink()
+        raise
+    return existed
+
+LATEST_POINTER_NAME = "latest.txt"
+
+def write_latest_pointer(storage_path: Path, filename: str) -> bool:
+    """
+    Record filename as the latest audio in storage_path/latest.txt
+    
+    The Flask /latest.<ext> route reads this pointer, so it can find the newest
+    file without following a symlink. The write is skipped when the pointer
+    already names filename.
+    
+    Returns:
+        True if the pointer was written
+    """
+    pointer_path = storage_path / LATEST_POINTER_NAME
+    try:
+        if pointer_path.read_text(encoding='utf-8').strip() == filename:
+            return False
+    except OSError:
+        pass
+    with _atomic_output(pointer_path) as tmp_path:
+        tmp_path.write_text(filename, encoding='utf-8')
+    return True
+
+def _run_coroutine(coro):
+    """
+    Run a coroutine to completion from synchronous code
+    
+    asyncio.run can't be called from a thread whose event loop is already
+    running, so in that case the coroutine gets its own loop on a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+# Script cleanup patterns used by _prepare_text_for_synthesis, compiled once
+_BOLD_MARKUP_RE = re.compile(r'\*\*[^*]+\*\*')
+_STAGE_DIRECTION_RE = re.compile(r'\([^)]*(?:pause|music|transition|intro|outro|fade|begin|start|end)[^)]*\)', re.IGNORECASE)
+_BARE_DIRECTION_RE = re.compile(r'\((?:pause|break|music|transition|intro|outro|fade|begin|start|end|breath|silence)\)', re.IGNORECASE)
+# The lookahead lets the scanner skip ahead to candidate first letters
+_SPEAKER_LABEL_RE = re.compile(r'(?=[HhAa])(?:Host|Assistant):\s*', re.IGNORECASE)
+_BRACKET_DIRECTION_RE = re.compile(r'\[[^\]]*(?:pause|music|sound|effect|transition)[^\]]*\]', re.IGNORECASE)
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+
+# Pauses kept in prepared text for SSML synthesis, rendered as breaks by _to_ssml
+_SSML_ELLIPSIS = '\u2026'
+_SSML_PARAGRAPH = '\n'
+
+# A sentence with its closing punctuation and trailing space; the last one may
+# have no closing punctuation
+_SENTENCE_RE = re.compile(r'[^.!?]+(?:[.!?]+\s*|$)|[.!?]+\s*')
+
+# MPEG audio Layer III bitrates (kbps) by bitrate index, for MPEG-1 and MPEG-2/2.5
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+def _mp3_frame_info(data, offset: int) -> Optional[tuple]:
+    """
+    Parse the Layer III frame header at offset
+    
+    Returns:
+        (frame_length, samples_per_frame, sample_rate), or None if there is no valid header
+    """
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[offset + 1] >> 3) & 0x03
+    layer = (data[offset + 1] >> 1) & 0x03
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    
+    padding = (data[offset + 2] >> 1) & 0x01
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    bitrate = _MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+    samples = 1152 if version == 3 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+def _is_vbr_info_frame(data, offset: int, frame_length: int) -> bool:
+    """Check whether the frame at offset is a Xing/Info/VBRI header rather than audio"""
+    frame = bytes(data[offset:offset + min(frame_length, 64)])
+    return b"Xing" in frame or b"Info" in frame or b"VBRI" in frame
+
+def _strip_mp3_headers(data: bytes) -> bytes:
+    """
+    Drop ID3 tags and the Xing/Info header frame from a synthesized MP3
+    
+    What's left is bare audio frames, which can be concatenated with the
+    frames of other chunks without players misreading the duration.
+    """
+    start = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        # Syncsafe size excludes the 10-byte header (and footer, if flagged)
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        start = 10 + size + (10 if data[5] & 0x10 else 0)
+    
+    while start < len(data) and _mp3_frame_info(data, start) is None:
+        start += 1
+    
+    info = _mp3_frame_info(data, start)
+    if info is None:
+        # Not MP3 we can parse; leave it untouched
+        return data
+    if _is_vbr_info_frame(data, start, info[0]):
+        start += info[0]
+    
+    end = len(data)
+    if end - start >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    
+    return data[start:end]
+
+def _mp3_duration_seconds(data) -> Optional[float]:
+    """
+    Sum the duration of the MP3 frames in data, skipping tags and header frames
+    
+    Returns:
+        Duration in seconds, or None if no audio frames were found
+    """
+    offset = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        offset = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+    
+    duration = 0.0
+    frames = 0
+    while offset < len(data):
+        info = _mp3_frame_info(data, offset)
+        if info is None:
+            # Resynchronise past a tag or garbage between concatenated streams
+            offset += 1
+            continue
+        
+        frame_length, samples, sample_rate = info
+        if not _is_vbr_info_frame(data, offset, frame_length):
+            duration += samples / sample_rate
+            frames += 1
+        offset += frame_length
+    
+    return duration if frames else None
 
 class AudioService:
     """
     Service for generating audio files from podcast scripts using Google Cloud Text-to-Speech
     """
     
+    # File extensions for the supported output encodings; MP3 stays the default
+    # because the player and nginx serve latest.mp3
+    AUDIO_EXTENSIONS = {"MP3": "mp3", "OGG_OPUS": "ogg"}
+    
+    # Encodings the streaming synthesis API can emit that are playable when
+    # written to disk response by response, mapped to their file extension
+    STREAMING_AUDIO_EXTENSIONS = {"OGG_OPUS": "ogg"}
+    
+    # Default number of concurrent synthesize_speech requests for chunked audio;
+    # override with TTS_CONCURRENT_REQUESTS
+    MAX_CONCURRENT_TTS_REQUESTS = 5
+    
+    # Retries for a chunk rejected with a quota or availability error
+    TTS_MAX_RETRIES = 3
+    
+    # Target request size for chunked audio; long requests synthesize much more
+    # slowly, and shorter ones spread across the concurrent requests
+    PARALLEL_CHUNK_SIZE = 1500
+    
+    # Largest text sent in a single request; the API limit (5000) is in UTF-8
+    # bytes, so non-ASCII scripts reach it before they reach 5000 characters
+    TTS_MAX_INPUT_BYTES = 4500
+    
+    # Pauses rendered into SSML input between paragraphs and at ellipses
+    SSML_PARAGRAPH_BREAK = '<break time="300ms"/>'
+    SSML_ELLIPSIS_BREAK = '<break time="150ms"/>'
+    
+    # Write buffer for streamed audio, which arrives as many small responses
+    AUDIO_WRITE_BUFFER_SIZE = 1024 * 1024
+    
+    # Chunked MP3 audio is synthesized as PCM at this rate and encoded once
+    # with ffmpeg when it is installed
+    PCM_SAMPLE_RATE = 24000
+    MP3_BITRATE = "64k"
+    
+    # Preview renditions (generate_audio(preview=True)) trade fidelity for size;
+    # spoken content loses little at 16 kHz
+    PREVIEW_SAMPLE_RATE = 16000
+    PREVIEW_EFFECTS_PROFILE = "small-bluetooth-speaker-class-device"
+    
+    # Synthesized audio is kept in a content-addressed cache under the storage
+    # directory; least recently used files are evicted above this size
+    AUDIO_CACHE_MAX_BYTES = 500 * 1024 * 1024
+    
+    # Keep the shared client's connection alive between podcasts instead of
+    # letting it idle out and paying for a new TLS handshake
+    GRPC_CHANNEL_OPTIONS = [("grpc.keepalive_time_ms", 30000)]
+    
+    # Global endpoint; a regional one (api_endpoint / TTS_API_ENDPOINT) cuts the
+    # round trip when the service runs in that region
+    DEFAULT_API_ENDPOINT = "texttospeech.googleapis.com"
+    
+    # TTS clients shared by every AudioService in the process, keyed by
+    # credentials path and endpoint; gRPC clients are thread-safe
+    _client_cache = {}
+    _client_cache_lock = threading.Lock()
+    
+    # Rejected credentials are remembered this long, so services created
+    # meanwhile don't each wait on a connection test that can't succeed;
+    # transient failures are retried by the next service
+    CLIENT_RETRY_SECONDS = 60
+    NON_RETRYABLE_ERRORS = (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied)
+    _client_failures = TTLCache(maxsize=8, ttl=CLIENT_RETRY_SECONDS)
+    
+    # Voice listings change over weeks; keep them for a day per client, and
+    # on disk so new processes start warm
+    VOICES_CACHE_TTL = 86400
+    _voices_cache = TTLCache(maxsize=8, ttl=VOICES_CACHE_TTL)
+    
     def __init__(self, 
                  credentials_path: Optional[str] = None,
                  language_code: str = "en-US",
                  voice_name: str = "en-US-Neural2-J",
                  audio_encoding: str = "MP3",
-                 audio_storage_path: str = "static/audio"):
+                 audio_storage_path: str = "static/audio",
+                 sample_rate_hertz: Optional[int] = None,
+                 api_endpoint: Optional[str] = None,
+                 use_ssml: bool = False):
         """
         Initialize the audio service
         
@@ -29,29 +349,93 @@ class AudioService:
             voice_name: Voice name (e.g., "en-US-Neural2-J")
             audio_encoding: Audio encoding format
             audio_storage_path: Directory to store generated audio files
+            sample_rate_hertz: Output sample rate (defaults to the voice's natural rate, 24 kHz for Neural2)
+            api_endpoint: Regional TTS endpoint (e.g. "eu-texttospeech.googleapis.com")
+            use_ssml: Send SSML with pause breaks instead of plain text; ignored for
+                Chirp 3 HD voices, which don't accept SSML
         """
         self.language_code = language_code
         self.voice_name = voice_name
+        
+        # Google Cloud TTS pricing (as of 2024)
+        # Neural2 voices: $16.00 per 1 million characters
+        # Standard voices: $4.00 per 1 million characters
+        is_neural = "Neural" in voice_name
+        self._voice_type = "Neural2" if is_neural else "Standard"
+        self._cost_per_million_chars = 16.00 if is_neural else 4.00
+        self._cost_per_char = self._cost_per_million_chars / 1_000_000
+        
+        self.audio_encoding_name = audio_encoding
         self.audio_encoding = getattr(texttospeech.AudioEncoding, audio_encoding)
+        self.audio_extension = self.AUDIO_EXTENSIONS.get(audio_encoding, audio_encoding.lower())
+        self.sample_rate_hertz = sample_rate_hertz
+        self.api_endpoint = api_endpoint or self.DEFAULT_API_ENDPOINT
+        self.use_ssml = use_ssml and "Chirp3-HD" not in voice_name
+        self.pcm_sample_rate = sample_rate_hertz or self.PCM_SAMPLE_RATE
         self.audio_storage_path = Path(audio_storage_path)
+        self._cache_dir = self.audio_storage_path / ".cache"
+        self.max_concurrent_requests = int(
+            os.environ.get('TTS_CONCURRENT_REQUESTS', self.MAX_CONCURRENT_TTS_REQUESTS)
+        )
+        
+        # Synthesis settings shared by every request, built once
+        self._voice = texttospeech.VoiceSelectionParams(
+            language_code=self.language_code,
+            name=self.voice_name
+        )
+        self._audio_config = texttospeech.AudioConfig(
+            audio_encoding=self.audio_encoding,
+            sample_rate_hertz=sample_rate_hertz or 0,  # 0 keeps the voice's natural rate
+            speaking_rate=1.0,  # Normal speed
+            pitch=0.0,          # Normal pitch
+            volume_gain_db=0.0  # Normal volume
+        )
+        self._preview_audio_config = texttospeech.AudioConfig(
+            audio_encoding=self.audio_encoding,
+            sample_rate_hertz=self.PREVIEW_SAMPLE_RATE,
+            effects_profile_id=[self.PREVIEW_EFFECTS_PROFILE],
+            speaking_rate=1.0,
+            pitch=0.0,
+            volume_gain_db=0.0
+        )
+        # Chunks joined before a single ffmpeg encode are requested as raw PCM
+        self._pcm_audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+            sample_rate_hertz=self.pcm_sample_rate,
+            speaking_rate=1.0,
+            pitch=0.0,
+            volume_gain_db=0.0
+        )
         
         # Create audio storage directory if it doesn't exist
         self.audio_storage_path.mkdir(parents=True, exist_ok=True)
+        self._cache_dir.mkdir(exist_ok=True)
         
-        # Initialize Google Cloud TTS client
+        # Initialize Google Cloud TTS client, reusing the one already connected
+        # in this process for the same credentials
+        self._credentials = None
+        if not (credentials_path and os.path.exists(credentials_path)):
+            # Use default credentials (environment variable or metadata server)
+            credentials_path = None
+        client_key = (credentials_path, self.api_endpoint)
+        self._client_key = client_key
         try:
-            if credentials_path and os.path.exists(credentials_path):
-                # Use service account credentials
-                credentials = service_account.Credentials.from_service_account_file(
-                    credentials_path
-                )
-                self.client = texttospeech.TextToSpeechClient(credentials=credentials)
-            else:
-                # Use default credentials (environment variable or metadata server)
-                self.client = texttospeech.TextToSpeechClient()
-                
-            # Test the connection
-            self._test_connection()
+            with self._client_cache_lock:
+                if client_key not in self._client_cache:
+                    failure = self._client_failures.get(client_key)
+                    if failure:
+                        raise RuntimeError(f"{failure} (retrying in at most {self.CLIENT_RETRY_SECONDS}s)")
+                    
+                    try:
+                        self.client, self._credentials = self._create_client(credentials_path)
+                        
+                        # Test the connection
+                        self._test_connection()
+                    except self.NON_RETRYABLE_ERRORS as e:
+                        self._client_failures.set(client_key, str(e))
+                        raise
+                    self._client_cache[client_key] = (self.client, self._credentials)
+                self.client, self._credentials = self._client_cache[client_key]
             self.is_available = True
             
         except Exception as e:
@@ -59,22 +443,41 @@ class AudioService:
             self.client = None
             self.is_available = False
     
+    def _create_client(self, credentials_path: Optional[str]):
+        """
+        Create a TTS client for api_endpoint on a gzip-compressed gRPC channel with keepalive
+        
+        Args:
+            credentials_path: Service account JSON file, or None for default credentials
+            
+        Returns:
+            Tuple of the client and the service account credentials (or None)
+        """
+        credentials = None
+        if credentials_path:
+            # Use service account credentials
+            credentials = service_account.Credentials.from_service_account_file(
+                credentials_path
+            )
+        
+        # Requests are gzip-compressed; chunk text is a few KB of plain English
+        transport_class = texttospeech.TextToSpeechClient.get_transport_class("grpc")
+        channel = transport_class.create_channel(
+            f"{self.api_endpoint}:443",
+            credentials=credentials,
+            compression=grpc.Compression.Gzip,
+            options=self.GRPC_CHANNEL_OPTIONS
+        )
+        client = texttospeech.TextToSpeechClient(
+            transport=transport_class(host=self.api_endpoint, channel=channel)
+        )
+        return client, credentials
+    
     def _test_connection(self):
-        """Test Google Cloud TTS connection with a simple synthesis"""
+        """Test Google Cloud TTS connection with a voice listing, which isn't billed"""
         try:
-            synthesis_input = texttospeech.SynthesisInput(text="Test")
-            voice = texttospeech.VoiceSelectionParams(
-                language_code=self.language_code,
-                name=self.voice_name
-            )
-            audio_config = texttospeech.AudioConfig(audio_encoding=self.audio_encoding)
-            
             # This will raise an exception if credentials are invalid
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
-            )
+            self.client.list_voices(language_code=self.language_code, timeout=5)
             
             logging.info("Google Cloud TTS connection test successful")
             
@@ -82,7 +485,24 @@ class AudioService:
             logging.error(f"Google Cloud TTS connection test failed: {e}")
             raise
     
-    def generate_audio(self, script_text: str, output_filename: str, metadata: Optional[Dict] = None) -> Dict[str, Any]:
+    def _check_credentials_error(self, error: Exception):
+        """
+        Mark the service unavailable if a request failed because its credentials were rejected
+        
+        The shared client is dropped and the failure remembered as for a rejected
+        connection test, so services created afterwards don't reuse it either.
+        """
+        if not isinstance(error, self.NON_RETRYABLE_ERRORS):
+            return
+        
+        logging.error(f"Google Cloud TTS rejected the credentials, disabling audio generation: {error}")
+        self.is_available = False
+        with self._client_cache_lock:
+            self._client_cache.pop(self._client_key, None)
+        self._client_failures.set(self._client_key, str(error))
+    
+    def generate_audio(self, script_text: str, output_filename: str, metadata: Optional[Dict] = None,
+                       preview: bool = False) -> Dict[str, Any]:
         """
         Generate audio file from text script
         
@@ -90,25 +510,26 @@ class AudioService:
             script_text: The podcast script text
             output_filename: Name for the output file (without extension)
             metadata: Optional metadata to save alongside audio
+            preview: Render a smaller 16 kHz version for mobile streaming; it is
+                written to "{output_filename}-preview" so the full-quality file
+                is kept, and it doesn't move the latest pointer
             
         Returns:
             Dictionary with generation results and file paths
         """
         if not self.is_available:
-            return {
-                "success": False,
-                "error": "Google Cloud TTS service is not available",
-                "audio_path": None,
-                "metadata_path": None
-            }
+            return _failure_result(_UNAVAILABLE_ERROR)
+        
+        if preview:
+            output_filename = f"{output_filename}-preview"
         
         try:
             # Create file paths
-            audio_path = self.audio_storage_path / f"{output_filename}.mp3"
+            audio_path = self.audio_storage_path / f"{output_filename}.{self.audio_extension}"
             metadata_path = self.audio_storage_path / f"{output_filename}_metadata.json"
             
-            # Always regenerate audio files (no caching)
-            # Remove existing files if they exist
+            # Remove existing files if they exist; they are never rewritten in
+            # place, since they may be hardlinked into the audio cache
             if audio_path.exists():
                 audio_path.unlink()
                 logging.info(f"Removed existing audio file: {audio_path}")
@@ -119,41 +540,60 @@ class AudioService:
             # Prepare text for synthesis
             prepared_text = self._prepare_text_for_synthesis(script_text)
             
-            # For long text, split into chunks and synthesize separately  
-            max_chunk_size = 4000  # Lower threshold to ensure chunking happens
-            if len(prepared_text) > max_chunk_size:
-                logging.info(f"Text is {len(prepared_text)} chars, splitting into chunks for TTS")
-                return self._generate_chunked_audio(prepared_text, audio_path, metadata_path, metadata)
-            
-            # Create synthesis input for short text
-            synthesis_input = texttospeech.SynthesisInput(text=prepared_text)
-            
-            # Configure voice
-            voice = texttospeech.VoiceSelectionParams(
-                language_code=self.language_code,
-                name=self.voice_name
-            )
+            # Reuse audio already synthesized from identical text and voice settings
+            cache_name = self._script_cache_key(prepared_text) + ("-preview" if preview else "")
+            cache_path = self._cache_dir / f"{cache_name}{audio_path.suffix}"
+            if self._restore_cached_audio(cache_path, audio_path):
+                generation_metadata = {
+                    "generated_at": datetime.now().isoformat(),
+                    "script_length": len(script_text),
+                    "prepared_text_length": len(prepared_text),
+                    "language_code": self.language_code,
+                    "voice_name": self.voice_name,
+                    "audio_encoding": self.audio_encoding_name,
+                    "file_size_bytes": audio_path.stat().st_size,
+                    "estimated_duration_minutes": len(prepared_text) // 150,
+                    "preview": preview,
+                    **(metadata or {})
+                }
+                _write_json(metadata_path, generation_metadata)
+                if not preview:
+                    self._mark_latest(audio_path)
+                
+                logging.info(f"Audio restored from cache: {audio_path}")
+                return {
+                    "success": True,
+                    "audio_path": str(audio_path),
+                    "metadata_path": str(metadata_path),
+                    "cached": True,
+                    "metadata": generation_metadata
+                }
             
-            # Configure audio settings
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=self.audio_encoding,
-                speaking_rate=1.0,  # Normal speed
-                pitch=0.0,          # Normal pitch
-                volume_gain_db=0.0  # Normal volume
-            )
+            # For long text, split into chunks and synthesize separately
+            text_bytes = self._input_bytes(prepared_text)
+            if text_bytes > self.TTS_MAX_INPUT_BYTES:
+                logging.info(f"Text is {text_bytes} bytes, splitting into chunks for TTS")
+                chunks = self._split_script_into_chunks(script_text)
+                result = self._generate_chunked_audio(prepared_text, audio_path, metadata_path, metadata,
+                                                      chunks=chunks, preview=preview)
+                if result["success"]:
+                    self._store_cached_audio(audio_path, cache_path)
+                return result
             
             logging.info(f"Generating audio for {len(prepared_text)} characters...")
             
             # Perform TTS synthesis
             response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
+                input=self._synthesis_input(prepared_text),
+                voice=self._voice,
+                audio_config=self._preview_audio_config if preview else self._audio_config
             )
             
             # Save audio file
-            with open(audio_path, "wb") as audio_file:
-                audio_file.write(response.audio_content)
+            with _atomic_output(audio_path) as tmp_path:
+                with open(tmp_path, "wb") as audio_file:
+                    audio_file.write(response.audio_content)
+            self._store_cached_audio(audio_path, cache_path)
             
             # Create metadata
             generation_metadata = {
@@ -162,21 +602,19 @@ class AudioService:
                 "prepared_text_length": len(prepared_text),
                 "language_code": self.language_code,
                 "voice_name": self.voice_name,
-                "audio_encoding": "MP3",
+                "audio_encoding": self.audio_encoding_name,
                 "file_size_bytes": len(response.audio_content),
                 "estimated_duration_minutes": len(prepared_text) // 150,  # ~150 words per minute
+                "preview": preview,
                 **(metadata or {})
             }
             
             # Save metadata
-            with open(metadata_path, 'w') as f:
-                json.dump(generation_metadata, f, indent=2)
+            _write_json(metadata_path, generation_metadata)
             
-            # Create symlink to latest audio
-            latest_audio_path = self.audio_storage_path / "latest.mp3"
-            if latest_audio_path.exists() or latest_audio_path.is_symlink():
-                latest_audio_path.unlink()
-            latest_audio_path.symlink_to(audio_path.name)
+            # Point latest.txt and the latest symlink at the new audio
+            if not preview:
+                self._mark_latest(audio_path)
             
             logging.info(f"Audio generated successfully: {audio_path}")
             
@@ -189,14 +627,10 @@ class AudioService:
             }
             
         except Exception as e:
+            self._check_credentials_error(e)
             error_msg = f"Audio generation failed: {e}"
             logging.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "audio_path": None,
-                "metadata_path": None
-            }
+            return _failure_result(error_msg)
     
     def _prepare_text_for_synthesis(self, text: str) -> str:
         """
@@ -208,134 +642,438 @@ class AudioService:
         Returns:
             Text optimized for speech synthesis
         """
-        import re
-        
         # Remove stage directions and formatting markers
         # Remove anything in double asterisks like **(Intro Music Fades)** or **Host:**
-        text = re.sub(r'\*\*[^*]+\*\*', '', text)
+        text = _BOLD_MARKUP_RE.sub('', text)
         
         # Remove parenthetical stage directions like (Pause), (Transition Music Starts)
-        text = re.sub(r'\([^)]*(?:pause|music|transition|intro|outro|fade|begin|start|end)[^)]*\)', '', text, flags=re.IGNORECASE)
+        text = _STAGE_DIRECTION_RE.sub('', text)
         
         # Remove any remaining parenthetical directions that are common stage directions
-        text = re.sub(r'\((?:pause|break|music|transition|intro|outro|fade|begin|start|end|breath|silence)\)', '', text, flags=re.IGNORECASE)
+        text = _BARE_DIRECTION_RE.sub('', text)
         
         # Remove any remaining single asterisks or markdown formatting
-        text = re.sub(r'\*+', '', text)
+        text = text.replace('*', '')
         
         # Remove speaker labels and other common stage directions
-        text = re.sub(r'Host:\s*', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'Assistant:\s*', '', text, flags=re.IGNORECASE)
+        text = _SPEAKER_LABEL_RE.sub('', text)
         
         # Remove any remaining stage direction patterns
-        text = re.sub(r'\[[^\]]*(?:pause|music|sound|effect|transition)[^\]]*\]', '', text, flags=re.IGNORECASE)
+        text = _BRACKET_DIRECTION_RE.sub('', text)
         
-        # Clean up extra spaces and line breaks after removing markers
-        text = re.sub(r'\s+', ' ', text)  # Replace multiple spaces with single space
-        text = re.sub(r'\n+', '\n', text)  # Replace multiple newlines with single newline
-        
-        # Remove excessive line breaks
-        text = text.replace('\n\n\n', '\n\n')
-        
-        # Add natural pauses for better pacing
-        text = text.replace('\n\n', '. ')  # Paragraph breaks become pauses
-        text = text.replace('...', ', ')  # Convert ellipses to natural pauses
+        if self.use_ssml:
+            # Keep paragraph breaks and ellipses as pause markers for _to_ssml
+            text = text.replace('...', _SSML_ELLIPSIS)
+            paragraphs = (' '.join(paragraph.split()) for paragraph in _PARAGRAPH_BREAK_RE.split(text))
+            text = _SSML_PARAGRAPH.join(paragraph for paragraph in paragraphs if paragraph)
+        else:
+            # Add natural pauses for better pacing
+            text = text.replace('...', ', ')  # Convert ellipses to natural pauses
+            
+            # Clean up extra spaces and line breaks after removing markers, including
+            # those the pauses left (paragraph breaks become single spaces)
+            text = ' '.join(text.split())
         
-        # Ensure proper sentence endings
+        # Ensure proper sentence endings; this never adds whitespace, so the
+        # text needs no second cleanup
         text = text.replace('. .', '.')
         text = text.replace('..', '.')
         
-        # Clean up any double spaces that might have been created
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
         # No truncation needed - chunking in generate_audio handles long text
         # Let the full text pass through to be chunked appropriately
         
         return text
     
-    def _generate_chunked_audio(self, text: str, audio_path, metadata_path, metadata: Optional[Dict] = None):
-        """Generate audio for long text by splitting into chunks and concatenating"""
-        try:
-            max_chunk_size = 3500  # Safe chunk size well under the 5000 char limit
-            chunks = []
-            
-            # Split text into chunks at sentence boundaries
-            sentences = text.split('. ')
-            current_chunk = ""
-            
-            for sentence in sentences:
-                sentence_with_period = sentence + '. '
-                if len(current_chunk + sentence_with_period) > max_chunk_size:
-                    if current_chunk:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = sentence_with_period
-                    else:
-                        # Single sentence is too long, truncate it
-                        chunks.append(sentence_with_period[:max_chunk_size])
-                        current_chunk = ""
+    def _to_ssml(self, text: str) -> str:
+        """
+        Render prepared text as SSML, turning its pause markers into breaks
+        
+        Args:
+            text: Text from _prepare_text_for_synthesis with use_ssml set
+            
+        Returns:
+            SSML document with one <p> per paragraph
+        """
+        paragraphs = [
+            f"<p>{xml_escape(paragraph).replace(_SSML_ELLIPSIS, self.SSML_ELLIPSIS_BREAK)}</p>"
+            for paragraph in text.split(_SSML_PARAGRAPH) if paragraph
+        ]
+        return f"<speak>{self.SSML_PARAGRAPH_BREAK.join(paragraphs)}</speak>"
+    
+    def _synthesis_input(self, text: str) -> texttospeech.SynthesisInput:
+        """Build the synthesis input for prepared text, as SSML when use_ssml is set"""
+        if self.use_ssml:
+            return texttospeech.SynthesisInput(ssml=self._to_ssml(text))
+        return texttospeech.SynthesisInput(text=text)
+    
+    def _mark_latest(self, audio_path: Path):
+        """
+        Point latest.txt and the latest.<ext> symlink at audio_path
+        
+        The symlink is what nginx serves directly; the pointer is read by the
+        Flask route. Both are replaced atomically.
+        """
+        write_latest_pointer(self.audio_storage_path, audio_path.name)
+        replace_symlink(self.audio_storage_path / f"latest{audio_path.suffix}", audio_path.name)
+    
+    def _input_bytes(self, text: str) -> int:
+        """Size in UTF-8 bytes of the request input for prepared text, including any SSML markup"""
+        return len((self._to_ssml(text) if self.use_ssml else text).encode('utf-8'))
+    
+    def _fits_request(self, text: str, max_chunk_size: int) -> bool:
+        """Check whether prepared text is within max_chunk_size characters and the request byte limit"""
+        return len(text) <= max_chunk_size and self._input_bytes(text) <= self.TTS_MAX_INPUT_BYTES
+    
+    def _hard_split(self, text: str, max_chunk_size: int) -> List[str]:
+        """
+        Split text with no usable sentence boundary into pieces that fit a request
+        
+        Each piece is the longest prefix that fits, cut back to its last space
+        when there is one in the second half.
+        
+        Args:
+            text: Prepared text, e.g. one overlong sentence
+            max_chunk_size: Maximum characters per piece
+            
+        Returns:
+            List of pieces, each within the request limits
+        """
+        pieces = []
+        while text and not self._fits_request(text, max_chunk_size):
+            # Longest fitting prefix; the byte size only grows with length
+            low, high = 1, min(len(text), max_chunk_size)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self._fits_request(text[:middle], max_chunk_size):
+                    low = middle
                 else:
-                    current_chunk += sentence_with_period
+                    high = middle - 1
+            
+            space = text.rfind(' ', 0, low)
+            cut = space if space > low // 2 else low
+            pieces.append(text[:cut].strip())
+            text = text[cut:].lstrip()
+        
+        if text:
+            pieces.append(text)
+        return [piece for piece in pieces if piece]
+    
+    def _split_text_into_chunks(self, text: str, max_chunk_size: int = 3500) -> List[str]:
+        """
+        Split text into chunks at sentence boundaries
+        
+        Args:
+            text: Prepared text
+            max_chunk_size: Maximum characters per chunk; chunks are also kept
+                within TTS_MAX_INPUT_BYTES of request input
+            
+        Returns:
+            List of text chunks
+        """
+        chunks = []
+        current_chunk = ""
+        
+        for match in _SENTENCE_RE.finditer(text):
+            sentence = match.group(0)
+            candidate = current_chunk + sentence
+            if self._fits_request(candidate.strip(), max_chunk_size):
+                current_chunk = candidate
+                continue
             
-            # Add the last chunk
-            if current_chunk:
+            if current_chunk.strip():
                 chunks.append(current_chunk.strip())
+            current_chunk = sentence
             
-            logging.info(f"Split text into {len(chunks)} chunks for TTS processing")
+            # A single sentence over the limit is split at the limit
+            if not self._fits_request(sentence.strip(), max_chunk_size):
+                pieces = self._hard_split(sentence.strip(), max_chunk_size)
+                chunks.extend(pieces[:-1])
+                current_chunk = pieces[-1] + " " if pieces else ""
+        
+        # Add the last chunk
+        if current_chunk.strip():
+            chunks.append(current_chunk.strip())
+        
+        return chunks
+    
+    def _split_script_into_chunks(self, script_text: str, max_chunk_size: Optional[int] = None) -> List[str]:
+        """
+        Split a raw script into prepared chunks at paragraph boundaries
+        
+        Paragraphs are packed together up to max_chunk_size characters and
+        TTS_MAX_INPUT_BYTES of request input; a paragraph that is too long on
+        its own is split at sentence boundaries instead.
+        
+        Args:
+            script_text: Raw podcast script, paragraphs separated by blank lines
+            max_chunk_size: Maximum characters per chunk (defaults to PARALLEL_CHUNK_SIZE)
+            
+        Returns:
+            List of prepared text chunks
+        """
+        max_chunk_size = max_chunk_size or self.PARALLEL_CHUNK_SIZE
+        separator = _SSML_PARAGRAPH if self.use_ssml else " "
+        chunks = []
+        current_chunk = ""
+        
+        for paragraph in _PARAGRAPH_BREAK_RE.split(script_text):
+            prepared = self._prepare_text_for_synthesis(paragraph)
+            if not prepared:
+                continue
             
-            # Generate audio for each chunk and concatenate raw bytes
-            audio_parts = []
-            total_audio_bytes = 0
+            if not self._fits_request(prepared, max_chunk_size):
+                if current_chunk:
+                    chunks.append(current_chunk)
+                    current_chunk = ""
+                chunks.extend(self._split_text_into_chunks(prepared, max_chunk_size))
+                continue
             
-            for i, chunk in enumerate(chunks):
-                logging.info(f"Processing chunk {i+1}/{len(chunks)} ({len(chunk)} chars)")
-                
-                # Create synthesis input
-                synthesis_input = texttospeech.SynthesisInput(text=chunk)
-                
-                # Configure voice and audio
-                voice = texttospeech.VoiceSelectionParams(
-                    language_code=self.language_code,
-                    name=self.voice_name
-                )
-                
-                audio_config = texttospeech.AudioConfig(
-                    audio_encoding=self.audio_encoding,
-                    speaking_rate=1.0,
-                    pitch=0.0,
-                    volume_gain_db=0.0
-                )
-                
-                # Perform TTS synthesis
-                response = self.client.synthesize_speech(
-                    input=synthesis_input,
-                    voice=voice,
-                    audio_config=audio_config
-                )
+            candidate = f"{current_chunk}{separator}{prepared}" if current_chunk else prepared
+            if self._fits_request(candidate, max_chunk_size):
+                current_chunk = candidate
+            else:
+                chunks.append(current_chunk)
+                current_chunk = prepared
+        
+        if current_chunk:
+            chunks.append(current_chunk)
+        
+        return chunks
+    
+    async def _synthesize_chunks(self, chunks: List[str], output_file, pcm: bool = False,
+                                 preview: bool = False) -> int:
+        """
+        Synthesize text chunks concurrently and write their audio in chunk order
+        
+        Chunks that finish early wait in a pending map until every chunk before
+        them has been written, so the file is assembled while later chunks are
+        still being synthesized. Memory use stays bounded by the reorder window
+        rather than growing with the number of chunks.
+        
+        Args:
+            chunks: Text chunks, each under the TTS request limit
+            output_file: Binary file object the audio is written to
+            pcm: Request LINEAR16 audio and write only the raw PCM frames
+            preview: Use the 16 kHz preview audio settings
+            
+        Returns:
+            Total number of audio bytes written
+        """
+        # grpc.aio channels are bound to the running loop, so create the client here
+        transport_class = texttospeech.TextToSpeechAsyncClient.get_transport_class("grpc_asyncio")
+        channel = transport_class.create_channel(
+            f"{self.api_endpoint}:443",
+            credentials=self._credentials,
+            compression=grpc.Compression.Gzip
+        )
+        client = texttospeech.TextToSpeechAsyncClient(
+            transport=transport_class(host=self.api_endpoint, channel=channel)
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        if pcm:
+            audio_config = self._pcm_audio_config
+        elif preview:
+            audio_config = self._preview_audio_config
+        else:
+            audio_config = self._audio_config
+        
+        # Chunks repeated from earlier podcasts (intros, outros, transitions)
+        # are read from the audio cache instead of being synthesized again
+        suffix = ".pcm" if pcm else f"{'.preview' if preview else ''}.{self.audio_encoding_name.lower()}"
+        cache_paths = [self._cache_dir / f"{self._script_cache_key(chunk)}{suffix}" for chunk in chunks]
+        cache_hits = 0
+        
+        # A chunk only starts once it is within reorder_window of the next chunk
+        # to be written, so at most that many finished chunks wait in memory
+        reorder_window = 2 * self.max_concurrent_requests
+        window_moved = asyncio.Condition()
+        next_index = 0
+        
+        async def synthesize(index: int, chunk: str):
+            nonlocal cache_hits
+            async with window_moved:
+                await window_moved.wait_for(lambda: index < next_index + reorder_window)
+            
+            # Cached chunks are passed on as open files and copied in the kernel;
+            # holding the file keeps its data even if eviction unlinks it
+            cached_file = self._open_cached_chunk(cache_paths[index])
+            if cached_file is not None:
+                cache_hits += 1
+                return index, cached_file
+            
+            async with semaphore:
+                logging.info(f"Processing chunk {index+1}/{len(chunks)} ({len(chunk)} chars)")
+                for attempt in range(self.TTS_MAX_RETRIES + 1):
+                    try:
+                        response = await client.synthesize_speech(
+                            input=self._synthesis_input(chunk),
+                            voice=self._voice,
+                            audio_config=audio_config
+                        )
+                        break
+                    except (google_exceptions.ResourceExhausted,
+                            google_exceptions.ServiceUnavailable) as e:
+                        if attempt == self.TTS_MAX_RETRIES:
+                            raise
+                        delay = 2 ** attempt + random.random()
+                        logging.warning(f"Chunk {index+1} rejected ({e}), retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                audio_data = response.audio_content
+                if pcm:
+                    # LINEAR16 responses carry a WAV header per chunk
+                    with wave.open(io.BytesIO(audio_data)) as wav_file:
+                        audio_data = wav_file.readframes(wav_file.getnframes())
+                elif self.audio_encoding_name == "MP3":
+                    # Concatenated chunks must be bare frames, or players take the
+                    # first chunk's Xing header as the length of the whole file
+                    audio_data = _strip_mp3_headers(audio_data)
+                self._write_cached_chunk(cache_paths[index], audio_data)
+                return index, audio_data
+        
+        tasks = [asyncio.create_task(synthesize(i, chunk)) for i, chunk in enumerate(chunks)]
+        pending = {}
+        bytes_written = 0
+        
+        try:
+            for finished in asyncio.as_completed(tasks):
+                index, audio_data = await finished
+                pending[index] = audio_data
                 
-                # Collect the audio bytes
-                audio_parts.append(response.audio_content)
-                total_audio_bytes += len(response.audio_content)
-            
-            # Simple concatenation of MP3 files (basic approach)
-            # Note: This may create minor audio artifacts between chunks
-            # but avoids dependency on ffmpeg
-            logging.info("Concatenating audio chunks...")
-            
-            with open(audio_path, "wb") as output_file:
-                for i, audio_data in enumerate(audio_parts):
-                    if i == 0:
-                        # Write the first file completely
-                        output_file.write(audio_data)
-                    else:
-                        # For subsequent files, skip the MP3 header (rough approach)
-                        # This is a simple concatenation that may not be perfect
-                        # but should work for basic needs
-                        output_file.write(audio_data)
+                # Drain every chunk that is now contiguous with what was written
+                if next_index in pending:
+                    while next_index in pending:
+                        audio_data = pending.pop(next_index)
+                        if isinstance(audio_data, bytes):
+                            output_file.write(audio_data)
+                            bytes_written += len(audio_data)
+                        else:
+                            with audio_data:
+                                bytes_written += self._copy_cached_chunk(audio_data, output_file)
+                        next_index += 1
+                    async with window_moved:
+                        window_moved.notify_all()
+            
+            if cache_hits:
+                logging.info(f"Reused {cache_hits}/{len(chunks)} chunks from the audio cache")
+            if cache_hits < len(chunks):
+                self._evict_cached_audio()
+            return bytes_written
+        finally:
+            for task in tasks:
+                task.cancel()
+            for audio_data in pending.values():
+                if not isinstance(audio_data, bytes):
+                    audio_data.close()
+            await client.transport.close()
+    
+    def _open_cached_chunk(self, cache_path: Path):
+        """Open a chunk's cached audio, marking it as recently used, or return None"""
+        try:
+            os.utime(cache_path)
+            return open(cache_path, "rb")
+        except FileNotFoundError:
+            return None
+    
+    def _copy_cached_chunk(self, cached_file, output_file) -> int:
+        """
+        Append a cached chunk file to output_file
+        
+        Uses os.sendfile so the bytes go from the page cache straight to the
+        output file or ffmpeg pipe, falling back to a buffered copy where
+        sendfile isn't available.
+        
+        Returns:
+            Number of bytes copied
+        """
+        size = os.fstat(cached_file.fileno()).st_size
+        offset = 0
+        try:
+            out_fd = output_file.fileno()
+            output_file.flush()
+            while offset < size:
+                sent = os.sendfile(out_fd, cached_file.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile on this platform, or an output without a file descriptor
+            cached_file.seek(offset)
+            shutil.copyfileobj(cached_file, output_file, 1024 * 1024)
+        return size
+    
+    def _write_cached_chunk(self, cache_path: Path, audio_data: bytes):
+        """Store a synthesized chunk in the audio cache, replacing it atomically"""
+        tmp_path = _temp_path(cache_path)
+        try:
+            tmp_path.write_bytes(audio_data)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Could not cache chunk audio {cache_path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def _encode_chunks_with_ffmpeg(self, chunks: List[str], audio_path: Path, ffmpeg_path: str):
+        """
+        Synthesize chunks as PCM, piping them into a single ffmpeg MP3 encode
+        
+        Args:
+            chunks: Text chunks, each under the TTS request limit
+            audio_path: MP3 file to write
+            ffmpeg_path: Path to the ffmpeg executable
+        """
+        command = [
+            ffmpeg_path, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "s16le", "-ar", str(self.pcm_sample_rate), "-ac", "1", "-i", "pipe:0",
+            "-codec:a", "libmp3lame", "-b:a", self.MP3_BITRATE, "-threads", "0",
+            "-f", "mp3", str(audio_path)
+        ]
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        try:
+            _run_coroutine(self._synthesize_chunks(chunks, process.stdin, pcm=True))
+            _, stderr = process.communicate()
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg encoding failed: {stderr.decode(errors='replace').strip()}")
+    
+    def _generate_chunked_audio(self, text: str, audio_path, metadata_path, metadata: Optional[Dict] = None,
+                                chunks: Optional[List[str]] = None, preview: bool = False):
+        """Generate audio for long text by splitting into chunks and concatenating"""
+        try:
+            chunks = chunks or self._split_text_into_chunks(text)
+            
+            logging.info(f"Split text into {len(chunks)} chunks for TTS processing")
+            
+            # Previews are encoded by the TTS service at their own sample rate
+            ffmpeg_path = shutil.which("ffmpeg") if self.audio_encoding_name == "MP3" and not preview else None
+            with _atomic_output(audio_path) as tmp_path:
+                if ffmpeg_path:
+                    # Concatenate PCM and encode the whole podcast once
+                    self._encode_chunks_with_ffmpeg(chunks, tmp_path, ffmpeg_path)
+                else:
+                    # Synthesize all chunks concurrently, concatenating them into the file
+                    # in chunk order as they complete
+                    # Note: MP3 chunks are stripped to bare frames so they join as one
+                    # stream, though the encoder padding at each join remains
+                    with open(tmp_path, "wb") as output_file:
+                        _run_coroutine(self._synthesize_chunks(chunks, output_file, preview=preview))
             
             # Estimate duration based on character count and typical speech rate
             estimated_duration_seconds = len(text) / 12  # ~12 characters per second for speech
             
+            # Count the MP3 frames for the real duration
+            actual_duration_seconds = None
+            if self.audio_encoding_name == "MP3" and audio_path.stat().st_size:
+                with open(audio_path, "rb") as audio_file, \
+                        mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ) as audio_data:
+                    actual_duration_seconds = _mp3_duration_seconds(audio_data)
+                if actual_duration_seconds:
+                    estimated_duration_seconds = actual_duration_seconds
+            
             # Create metadata
             generation_metadata = {
                 "generated_at": datetime.now().isoformat(),
@@ -343,22 +1081,21 @@ class AudioService:
                 "prepared_text_length": len(text),
                 "language_code": self.language_code,
                 "voice_name": self.voice_name,
-                "audio_encoding": "MP3",
+                "audio_encoding": self.audio_encoding_name,
                 "file_size_bytes": audio_path.stat().st_size,
                 "estimated_duration_minutes": int(estimated_duration_seconds // 60),
                 "chunks_processed": len(chunks),
+                "actual_duration_seconds": actual_duration_seconds,
+                "preview": preview,
                 **(metadata or {})
             }
             
             # Save metadata
-            with open(metadata_path, 'w') as f:
-                json.dump(generation_metadata, f, indent=2)
+            _write_json(metadata_path, generation_metadata)
             
-            # Create symlink to latest audio
-            latest_audio_path = self.audio_storage_path / "latest.mp3"
-            if latest_audio_path.exists() or latest_audio_path.is_symlink():
-                latest_audio_path.unlink()
-            latest_audio_path.symlink_to(audio_path.name)
+            # Point latest.txt and the latest symlink at the new audio
+            if not preview:
+                self._mark_latest(audio_path)
             
             logging.info(f"Chunked audio generated successfully: {audio_path}")
             logging.info(f"Total file size: {audio_path.stat().st_size / 1024 / 1024:.1f}MB")
@@ -373,14 +1110,10 @@ class AudioService:
             }
             
         except Exception as e:
+            self._check_credentials_error(e)
             error_msg = f"Chunked audio generation failed: {e}"
             logging.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "audio_path": None,
-                "metadata_path": None
-            }
+            return _failure_result(error_msg)
     
     def generate_podcast_audio(self, podcast_script_data: Dict[str, Any], date_str: str) -> Dict[str, Any]:
         """
@@ -394,18 +1127,23 @@ class AudioService:
             Dictionary with generation results
         """
         if not podcast_script_data or "script" not in podcast_script_data:
-            return {
-                "success": False,
-                "error": "Invalid podcast script data",
-                "audio_path": None
-            }
+            return _failure_result(_INVALID_SCRIPT_ERROR)
         
         script = podcast_script_data["script"]
-        metadata = podcast_script_data.get("metadata", {})
+        cache_key = self._script_cache_key(script)
+        metadata = {**podcast_script_data.get("metadata", {}), "script_hash": cache_key}
         
         # Generate filename
         filename = f"{date_str}_super-gems"
         
+        cached_result = self._find_cached_audio(
+            self.audio_storage_path / f"{filename}.{self.audio_extension}",
+            self.audio_storage_path / f"{filename}_metadata.json",
+            cache_key
+        )
+        if cached_result:
+            return cached_result
+        
         # Generate audio
         result = self.generate_audio(
             script_text=script,
@@ -415,6 +1153,253 @@ class AudioService:
         
         return result
     
+    def _script_cache_key(self, script: str) -> str:
+        """
+        Hash the script together with the voice settings that shape its audio
+        
+        Args:
+            script: Podcast script text
+            
+        Returns:
+            Short hex digest stored in the audio metadata as script_hash
+        """
+        digest = hashlib.sha256()
+        parts = [self.language_code, self.voice_name, self.audio_encoding_name, script]
+        if self.sample_rate_hertz:
+            # Only hashed when set, so keys for the natural rate stay unchanged
+            parts.insert(3, str(self.sample_rate_hertz))
+        if self.use_ssml:
+            parts.insert(3, "ssml")
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()[:16]
+    
+    def _find_cached_audio(self, audio_path: Path, metadata_path: Path, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached generation result if audio_path was made from the same script
+        
+        Args:
+            audio_path: Audio file the script would be written to
+            metadata_path: Metadata file saved next to it
+            cache_key: Key from _script_cache_key for the current script
+            
+        Returns:
+            Result dictionary with cached=True, or None if the audio must be generated
+        """
+        try:
+            if not audio_path.is_file():
+                return None
+            cached_metadata = _read_json(metadata_path)
+        except (OSError, ValueError):
+            return None
+        
+        if cached_metadata.get("script_hash") != cache_key:
+            return None
+        
+        logging.info(f"Reusing audio generated from an identical script: {audio_path}")
+        return {
+            "success": True,
+            "audio_path": str(audio_path),
+            "metadata_path": str(metadata_path),
+            "cached": True,
+            "metadata": cached_metadata
+        }
+    
+    def _restore_cached_audio(self, cache_path: Path, audio_path: Path) -> bool:
+        """
+        Link cached audio to audio_path, marking it as recently used
+        
+        Returns:
+            True if the cache held the audio
+        """
+        try:
+            os.utime(cache_path)
+            os.link(cache_path, audio_path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            # Filesystem without hardlinks
+            shutil.copyfile(cache_path, audio_path)
+        return True
+    
+    def _store_cached_audio(self, audio_path: Path, cache_path: Path):
+        """Add a freshly synthesized file to the audio cache and evict old entries"""
+        tmp_path = _temp_path(cache_path)
+        try:
+            try:
+                os.link(audio_path, tmp_path)
+            except OSError:
+                shutil.copyfile(audio_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Could not cache audio {audio_path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        
+        self._evict_cached_audio()
+    
+    def _evict_cached_audio(self):
+        """Delete least recently used cache files until the cache fits AUDIO_CACHE_MAX_BYTES"""
+        entries = []
+        total_size = 0
+        with os.scandir(self._cache_dir) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        
+        if total_size <= self.AUDIO_CACHE_MAX_BYTES:
+            return
+        
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            logging.info(f"Evicted cached audio: {os.path.basename(path)}")
+            if total_size <= self.AUDIO_CACHE_MAX_BYTES:
+                break
+    
+    def supports_streaming(self) -> bool:
+        """
+        Check whether the configured voice and encoding can use streaming synthesis
+        
+        Streaming synthesis is only offered for Chirp 3 HD voices and cannot emit MP3
+        """
+        return (
+            self.is_available
+            and hasattr(self.client, "streaming_synthesize")
+            and "Chirp3-HD" in self.voice_name
+            and self.audio_encoding_name in self.STREAMING_AUDIO_EXTENSIONS
+        )
+    
+    def generate_podcast_audio_streaming(self, podcast_script_data: Dict[str, Any], date_str: str) -> Dict[str, Any]:
+        """
+        Generate podcast audio with the streaming synthesis API, writing audio as it arrives
+        
+        Falls back to generate_podcast_audio when the voice or encoding can't be
+        streamed, or when the API rejects the stream as unimplemented
+        
+        Args:
+            podcast_script_data: Output from PodcastGenerator.generate_podcast_script()
+            date_str: Date string for filename (e.g., "2025-01-15")
+            
+        Returns:
+            Dictionary with generation results
+        """
+        if not self.supports_streaming():
+            return self.generate_podcast_audio(podcast_script_data, date_str)
+        
+        if not podcast_script_data or "script" not in podcast_script_data:
+            return _failure_result(_INVALID_SCRIPT_ERROR)
+        
+        script = podcast_script_data["script"]
+        cache_key = self._script_cache_key(script)
+        metadata = {**podcast_script_data.get("metadata", {}), "script_hash": cache_key}
+        
+        extension = self.STREAMING_AUDIO_EXTENSIONS[self.audio_encoding_name]
+        filename = f"{date_str}_super-gems"
+        audio_path = self.audio_storage_path / f"{filename}.{extension}"
+        metadata_path = self.audio_storage_path / f"{filename}_metadata.json"
+        
+        cached_result = self._find_cached_audio(audio_path, metadata_path, cache_key)
+        if cached_result:
+            return cached_result
+        
+        try:
+            # Streaming input doesn't accept SSML, which the prepared text never contains
+            prepared_text = self._prepare_text_for_synthesis(script)
+            chunks = self._split_text_into_chunks(prepared_text)
+            
+            # Audio from an identical script saved under another date is linked
+            # from the content cache. Only a hit unlinks the old file first; a
+            # fresh synthesis replaces it atomically, so it stays servable until then
+            cache_path = self._cache_dir / f"{self._script_cache_key(prepared_text)}{audio_path.suffix}"
+            restored = False
+            if cache_path.exists():
+                audio_path.unlink(missing_ok=True)
+                restored = self._restore_cached_audio(cache_path, audio_path)
+            
+            def request_stream():
+                # The first request carries the config, the rest carry text
+                yield texttospeech.StreamingSynthesizeRequest(
+                    streaming_config=texttospeech.StreamingSynthesizeConfig(
+                        voice=self._voice,
+                        streaming_audio_config=texttospeech.StreamingAudioConfig(
+                            audio_encoding=self.audio_encoding
+                        )
+                    )
+                )
+                for chunk in chunks:
+                    yield texttospeech.StreamingSynthesizeRequest(
+                        input=texttospeech.StreamingSynthesisInput(text=chunk)
+                    )
+            
+            if restored:
+                file_size = audio_path.stat().st_size
+                logging.info(f"Audio restored from cache: {audio_path}")
+            else:
+                logging.info(f"Streaming audio for {len(prepared_text)} characters in {len(chunks)} chunks...")
+                
+                file_size = 0
+                with _atomic_output(audio_path) as tmp_path:
+                    with open(tmp_path, "wb", buffering=self.AUDIO_WRITE_BUFFER_SIZE) as audio_file:
+                        for response in self.client.streaming_synthesize(request_stream()):
+                            audio_file.write(response.audio_content)
+                            file_size += len(response.audio_content)
+                self._store_cached_audio(audio_path, cache_path)
+            
+            # Estimate duration based on character count and typical speech rate
+            estimated_duration_seconds = len(prepared_text) / 12  # ~12 characters per second for speech
+            
+            generation_metadata = {
+                "generated_at": datetime.now().isoformat(),
+                "script_length": len(script),
+                "prepared_text_length": len(prepared_text),
+                "language_code": self.language_code,
+                "voice_name": self.voice_name,
+                "audio_encoding": self.audio_encoding_name,
+                "file_size_bytes": file_size,
+                "estimated_duration_minutes": int(estimated_duration_seconds // 60),
+                "chunks_processed": len(chunks),
+                **(metadata or {})
+            }
+            
+            _write_json(metadata_path, generation_metadata)
+            
+            # Point latest.txt and the latest symlink at the new audio
+            self._mark_latest(audio_path)
+            
+            logging.info(f"Streamed audio generated successfully: {audio_path}")
+            
+            return {
+                "success": True,
+                "audio_path": str(audio_path),
+                "metadata_path": str(metadata_path),
+                "cached": restored,
+                "metadata": generation_metadata
+            }
+            
+        except google_exceptions.MethodNotImplemented as e:
+            # The endpoint or voice doesn't offer streaming after all; the
+            # partial file was already discarded, so synthesize it in full
+            logging.warning(f"Streaming synthesis unavailable, using batch synthesis: {e}")
+            return self.generate_podcast_audio(podcast_script_data, date_str)
+            
+        except Exception as e:
+            self._check_credentials_error(e)
+            error_msg = f"Streaming audio generation failed: {e}"
+            logging.error(error_msg)
+            return _failure_result(error_msg)
+    
     def cleanup_old_files(self, max_age_days: int = 30):
         """
         Clean up old audio files
@@ -425,11 +1410,23 @@ class AudioService:
         try:
             cutoff_time = datetime.now().timestamp() - (max_age_days * 86400)
             
-            for file_path in self.audio_storage_path.iterdir():
-                if file_path.is_file() and not file_path.is_symlink():
-                    if file_path.stat().st_mtime < cutoff_time:
-                        file_path.unlink()
-                        logging.info(f"Cleaned up old audio file: {file_path}")
+            # Audio files and their metadata JSON are pruned in the same pass;
+            # DirEntry caches the file type, so only the mtime needs a stat
+            removed = []
+            with os.scandir(self.audio_storage_path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.name == LATEST_POINTER_NAME:
+                            continue
+                        if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff_time:
+                            os.unlink(entry.path)
+                            removed.append(entry.name)
+                    except FileNotFoundError:
+                        # Replaced or removed by a concurrent generation
+                        continue
+            
+            if removed:
+                logging.info(f"Cleaned up {len(removed)} old audio files: {', '.join(sorted(removed))}")
                         
         except Exception as e:
             logging.error(f"Error cleaning up old audio files: {e}")
@@ -439,26 +1436,46 @@ class AudioService:
         Get list of available voices from Google Cloud TTS
         
         Returns:
-            Dictionary with available voices by language
+            Dictionary keyed by language, each holding parallel "names",
+            "genders" and "rates" lists (one entry per voice)
         """
         if not self.is_available:
             return {"error": "TTS service not available"}
         
+        voice_data = self._voices_cache.get(self._client_key)
+        if voice_data is not None:
+            return voice_data
+        
+        # Dot-named, so audio cache eviction leaves it alone
+        voices_path = self._cache_dir / f".voices-{self.api_endpoint}.json"
+        try:
+            if time.time() - voices_path.stat().st_mtime < self.VOICES_CACHE_TTL:
+                voice_data = _read_json(voices_path)
+                self._voices_cache.set(self._client_key, voice_data)
+                return voice_data
+        except (OSError, ValueError):
+            pass
+        
         try:
             voices = self.client.list_voices()
             
             voice_data = {}
             for voice in voices.voices:
+                gender = voice.ssml_gender.name
                 for language_code in voice.language_codes:
-                    if language_code not in voice_data:
-                        voice_data[language_code] = []
+                    columns = voice_data.get(language_code)
+                    if columns is None:
+                        columns = voice_data[language_code] = {"names": [], "genders": [], "rates": []}
                     
-                    voice_data[language_code].append({
-                        "name": voice.name,
-                        "gender": voice.ssml_gender.name,
-                        "natural_sample_rate": voice.natural_sample_rate_hertz
-                    })
+                    columns["names"].append(voice.name)
+                    columns["genders"].append(gender)
+                    columns["rates"].append(voice.natural_sample_rate_hertz)
             
+            self._voices_cache.set(self._client_key, voice_data)
+            try:
+                _write_json(voices_path, voice_data)
+            except OSError as e:
+                logging.warning(f"Could not cache voice list: {e}")
             return voice_data
             
         except Exception as e:
@@ -475,21 +1492,9 @@ class AudioService:
         Returns:
             Dictionary with cost estimation
         """
-        # Google Cloud TTS pricing (as of 2024)
-        # Neural2 voices: $16.00 per 1 million characters
-        # Standard voices: $4.00 per 1 million characters
-        
-        neural_cost_per_char = 16.00 / 1_000_000
-        standard_cost_per_char = 4.00 / 1_000_000
-        
-        is_neural = "Neural" in self.voice_name
-        cost_per_char = neural_cost_per_char if is_neural else standard_cost_per_char
-        
-        estimated_cost = text_length * cost_per_char
-        
         return {
             "text_length": text_length,
-            "voice_type": "Neural2" if is_neural else "Standard",
-            "estimated_cost_usd": round(estimated_cost, 6),
-            "cost_per_million_chars": 16.00 if is_neural else 4.00
+            "voice_type": self._voice_type,
+            "estimated_cost_usd": round(text_length * self._cost_per_char, 6),
+            "cost_per_million_chars": self._cost_per_million_chars
         }
\ No newline at end of file
@@ -1,12 +1,71 @@
 import os
 import json
 import re
-from typing import Dict, List, Any
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 import google.generativeai as genai
 from dataclasses import dataclass
 from urllib.parse import urlparse
 
+# Spoken forms of technical terms, matched in one pass by _ACRONYM_RE
+_ACRONYMS = {
+    'API': 'A P I',
+    'ML': 'machine learning',
+    'AI': 'artificial intelligence',
+    'JS': 'JavaScript',
+    'CSS': 'C S S',
+    'HTML': 'H T M L',
+    'SQL': 'S Q L',
+    'CLI': 'command line interface',
+    'GUI': 'graphical user interface',
+    'OS': 'operating system',
+    'UI': 'user interface',
+    'UX': 'user experience',
+}
+_ACRONYM_RE = re.compile(r'\b(' + '|'.join(_ACRONYMS) + r')\b')
+
+# Star ratings by count, and dot indicators by count; longer runs are read
+# as repeated full ratings followed by the remainder
+_STAR_RATINGS = ('', 'one out of five stars', 'two out of five stars', 'three out of five stars',
+                 'four out of five stars')
+_DOT_RATINGS = ('', 'basic rating', 'good rating', 'excellent rating')
+_RATING_RE = re.compile(r'(⭐+)|(●+)')
+
+def _spoken_rating(match: re.Match) -> str:
+    """Spell out a run of rating stars or dots"""
+    stars, dots = match.group(1, 2)
+    if stars:
+        full, rest = divmod(len(stars), 5)
+        return 'five out of five stars' * full + _STAR_RATINGS[rest]
+    full, rest = divmod(len(dots), 4)
+    return 'exceptional rating' * full + _DOT_RATINGS[rest]
+
+# Substitutions applied in order by _optimize_text_for_tts, compiled once
+_TTS_SUBS = (
+    # URL handling
+    (re.compile(r'https?://github\.com/([^/]+)/([^/\s]+)'), r'github repository by \1'),
+    (re.compile(r'https?://([^/\s]+)\.com[^\s]*'), r'\1 dot com'),
+    (re.compile(r'https?://([^/\s]+)\.[a-z]{2,4}[^\s]*'), r'\1 website'),
+    
+    # Technical term handling
+    (_ACRONYM_RE, lambda match: _ACRONYMS[match.group(1)]),
+    
+    # Ratings conversion and dot indicators
+    (_RATING_RE, _spoken_rating),
+    
+    # Ensure space after pauses
+    (re.compile(r'\.\.\.\s*'), '... '),
+    
+    # Code snippets removal (replace with description)
+    (re.compile(r'```[^`]*```'), '[code example]'),
+    (re.compile(r'`[^`]+`'), '[code term]'),
+)
+
 @dataclass
 class PodcastMetadata:
     """Metadata for generated podcast"""
@@ -21,10 +80,64 @@ class PodcastGenerator:
     Service to generate podcast scripts from Super Gems analyses using Gemini 2.5 Flash-Lite
     """
     
-    def __init__(self, gemini_api_key: str):
+    MODEL_NAME = 'gemini-2.5-flash-lite'
+    
+    # Gem segments are generated concurrently; each call is a network round
+    # trip to Gemini, so a few threads cut the episode's wall time
+    MAX_CONCURRENT_GEM_REQUESTS = 8
+    
+    # Seconds each round of concurrent gem requests may take before the
+    # remaining gems use the fallback script
+    GEM_SCRIPT_TIMEOUT = 30
+    
+    # Output budget per gem; segments are 150-300 words, so this leaves
+    # headroom without reserving the whole episode's budget for each call
+    GEM_MAX_OUTPUT_TOKENS = 600
+    
+    # Gem context sent to Gemini: the analysis is cut to this many characters
+    # and the strength/improvement lists to their first few items
+    PROMPT_ANALYSIS_CHARS = 1200
+    PROMPT_LIST_ITEMS = 3
+    
+    # Generated gem scripts are kept on disk so re-runs over unchanged gems
+    # skip Gemini; entries older than this are dropped when the cache is opened
+    SCRIPT_CACHE_MAX_AGE_DAYS = 30
+    
+    # Script cache connections shared by every generator in the process, keyed
+    # by path, each with the lock that serializes its use across threads
+    _script_caches = {}
+    _script_caches_lock = threading.Lock()
+    
+    # Static instructions shared by every gem prompt; a batched request sends
+    # them once for all of its gems
+    SCRIPT_INSTRUCTIONS = """You are an experienced podcast host for tech content. Convert the following HN Super Gems analysis into a natural, flowing podcast script segment in English.
+
+IMPORTANT for audio optimization:
+- Simplify URLs (e.g. "github dot com slash username slash project" instead of full URL)
+- Format technical terms for speech-friendly pronunciation
+- Create natural transitions between topics
+- Add pause markers (...) for better listening flow
+- No visual elements (stars, dots) - describe verbally
+- Keep segment to 1-2 minutes (150-300 words) for efficient processing
+
+Structure:
+1. Brief introduction for this gem
+2. Explain the problem/innovation
+3. Technical highlights and implementation details
+4. Conclusion"""
+    
+    def __init__(self, gemini_api_key: str, script_cache_path: Optional[str] = None):
         """Initialize the podcast generator with Gemini API"""
         genai.configure(api_key=gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash-lite')
+        self.model = genai.GenerativeModel(self.MODEL_NAME)
+        
+        # Disk cache of generated gem scripts, kept next to the audio cache
+        # in the storage directory unless configured otherwise
+        if not script_cache_path:
+            script_cache_path = os.environ.get('GEM_SCRIPT_CACHE_PATH') or os.path.join(
+                os.environ.get('AUDIO_STORAGE_PATH', 'static/audio'), '.cache', '.gem_scripts.db'
+            )
+        self._script_cache, self._script_cache_lock = self._open_script_cache(script_cache_path)
         
         # Generation config for consistent, natural speech
         self.generation_config = genai.types.GenerationConfig(
@@ -32,6 +145,11 @@ class PodcastGenerator:
             top_p=0.8,
             max_output_tokens=8000,  # Increased for multiple gems
         )
+        self.gem_generation_config = genai.types.GenerationConfig(
+            temperature=self.generation_config.temperature,
+            top_p=self.generation_config.top_p,
+            max_output_tokens=self.GEM_MAX_OUTPUT_TOKENS
+        )
     
     def generate_podcast_script(self, super_gems_data: dict) -> Dict[str, Any]:
         """
@@ -52,28 +170,8 @@ class PodcastGenerator:
         # Generate intro
         intro = self._create_intro(len(gems), generation_date)
         
-        # Generate segments for each gem
-        gem_segments = []
-        for i, gem in enumerate(gems):
-            try:
-                print(f"Generating script for gem {i+1}/{len(gems)}: {gem.get('title', 'Unknown')}")
-                segment = self._generate_gem_script(gem)
-                if segment:
-                    gem_segments.append(segment)
-                    print(f"✅ Generated {len(segment.split())} words for gem {i+1}")
-                else:
-                    print(f"❌ Empty segment for gem {i+1}")
-            except Exception as e:
-                print(f"❌ Error generating script for gem {gem.get('hn_id', 'unknown')}: {e}")
-                # Try fallback script
-                try:
-                    fallback = self._generate_fallback_script(gem)
-                    if fallback:
-                        gem_segments.append(fallback)
-                        print(f"✅ Used fallback script for gem {i+1}")
-                except Exception as fallback_error:
-                    print(f"❌ Fallback also failed for gem {i+1}: {fallback_error}")
-                continue
+        # Generate segments for all gems, in one request where possible
+        gem_segments = self._generate_gem_segments(gems)
         
         # Generate outro
         outro = self._create_outro()
@@ -98,6 +196,212 @@ class PodcastGenerator:
             "metadata": metadata.__dict__
         }
     
+    def _generate_gem_segments(self, gems: List[dict]) -> List[str]:
+        """
+        Generate the script segments for all gems, reusing cached scripts
+        
+        Args:
+            gems: Gems from the super gems data
+            
+        Returns:
+            Non-empty segments in gem order
+        """
+        scripts = [self._load_gem_script(gem) for gem in gems]
+        missing = [i for i, script in enumerate(scripts) if script is None]
+        if len(missing) < len(gems):
+            print(f"Using cached scripts for {len(gems) - len(missing)} of {len(gems)} gems")
+        
+        if missing:
+            generated = self._generate_batched_segments([gems[i] for i in missing])
+            for i, script in zip(missing, generated):
+                scripts[i] = script
+        
+        gem_segments = []
+        for i, script in enumerate(scripts):
+            if script:
+                gem_segments.append(script)
+                print(f"✅ Generated {len(script.split())} words for gem {i+1}")
+            else:
+                print(f"❌ Empty segment for gem {i+1}")
+        
+        return gem_segments
+    
+    def _generate_batched_segments(self, gems: List[dict]) -> List[str]:
+        """
+        Generate the script segments for several gems with a single Gemini request
+        
+        The instructions are sent once for the whole batch and the segments
+        come back as a JSON array. A response cut off at the token limit is
+        retried as two smaller batches; one that can't be parsed falls back to
+        a request per gem.
+        
+        Args:
+            gems: Gems to generate scripts for
+            
+        Returns:
+            One script per gem, in gem order; empty if none was generated
+        """
+        gem_prompts = "\n\n".join(
+            f"Gem {i+1}:\n{self._create_gem_prompt(gem)}" for i, gem in enumerate(gems)
+        )
+        prompt = (f"{self.SCRIPT_INSTRUCTIONS}\n\n"
+                  f"Generate podcast script segments for these {len(gems)} gems. Return a JSON array "
+                  f"of {len(gems)} strings, one segment per gem in the order given.\n\n{gem_prompts}")
+        
+        try:
+            print(f"Generating scripts for {len(gems)} gems in one request")
+            # Structured output is available from google-generativeai 0.7
+            response = self.model.generate_content(
+                prompt,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=self.generation_config.temperature,
+                    top_p=self.generation_config.top_p,
+                    max_output_tokens=min(self.generation_config.max_output_tokens,
+                                          self.GEM_MAX_OUTPUT_TOKENS * len(gems)),
+                    response_mime_type="application/json",
+                    response_schema=list[str]
+                )
+            )
+            
+            finish_reason = getattr(response.candidates[0].finish_reason, 'name', None)
+            if finish_reason == 'MAX_TOKENS' and len(gems) > 1:
+                half = len(gems) // 2
+                print(f"Response truncated, splitting into batches of {half} and {len(gems) - half} gems")
+                return (self._generate_batched_segments(gems[:half])
+                        + self._generate_batched_segments(gems[half:]))
+            
+            segments = json.loads(response.text)
+            if (not isinstance(segments, list) or len(segments) != len(gems)
+                    or not all(isinstance(segment, str) for segment in segments)):
+                raise ValueError(f"expected a list of {len(gems)} strings")
+            
+        except Exception as e:
+            print(f"❌ Batched script generation failed for {len(gems)} gems, generating them one by one: {e}")
+            return self._generate_individual_segments(gems)
+        
+        scripts = []
+        for gem, segment in zip(gems, segments):
+            script = self._optimize_text_for_tts(segment)
+            if script:
+                self._store_gem_script(gem, script)
+            scripts.append(script)
+        
+        return scripts
+    
+    def _generate_individual_segments(self, gems: List[dict]) -> List[str]:
+        """
+        Generate the script segments with one concurrent Gemini request per gem
+        
+        Args:
+            gems: Gems to generate scripts for
+            
+        Returns:
+            One script per gem, in gem order; gems whose request fails or times
+            out use the fallback script, or an empty one if that fails too
+        """
+        max_workers = min(self.MAX_CONCURRENT_GEM_REQUESTS, len(gems))
+        rounds = -(-len(gems) // max_workers)
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gem-script')
+        try:
+            futures = []
+            for i, gem in enumerate(gems):
+                print(f"Generating script for gem {i+1}/{len(gems)}: {gem.get('title', 'Unknown')}")
+                futures.append(executor.submit(self._generate_gem_script, gem))
+            wait(futures, timeout=self.GEM_SCRIPT_TIMEOUT * rounds)
+        finally:
+            # Requests still running past the timeout are abandoned, not awaited
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        scripts = []
+        for i, (gem, future) in enumerate(zip(gems, futures)):
+            try:
+                if not future.done():
+                    raise TimeoutError(f"no response within {self.GEM_SCRIPT_TIMEOUT * rounds}s")
+                scripts.append(future.result())
+            except Exception as e:
+                print(f"❌ Error generating script for gem {gem.get('hn_id', 'unknown')}: {e}")
+                # Try fallback script
+                try:
+                    scripts.append(self._generate_fallback_script(gem))
+                    print(f"✅ Used fallback script for gem {i+1}")
+                except Exception as fallback_error:
+                    print(f"❌ Fallback also failed for gem {i+1}: {fallback_error}")
+                    scripts.append("")
+        
+        return scripts
+    
+    @classmethod
+    def _open_script_cache(cls, path: str):
+        """
+        Return the shared (connection, lock) for the gem script cache at path
+        
+        The connection is opened, and expired entries dropped, once per process;
+        later generators reuse it. The connection is None if the cache can't be
+        opened, in which case this generator skips caching.
+        """
+        path = os.path.abspath(path)
+        with cls._script_caches_lock:
+            if path in cls._script_caches:
+                return cls._script_caches[path]
+            
+            connection = None
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS gem_script_cache "
+                    "(key TEXT PRIMARY KEY, script TEXT NOT NULL, created REAL NOT NULL)"
+                )
+                connection.execute(
+                    "DELETE FROM gem_script_cache WHERE created < ?",
+                    (time.time() - cls.SCRIPT_CACHE_MAX_AGE_DAYS * 86400,)
+                )
+                connection.commit()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Gem script cache unavailable at {path}: {e}")
+                if connection is not None:
+                    connection.close()
+                return None, threading.Lock()
+            
+            cls._script_caches[path] = (connection, threading.Lock())
+            return cls._script_caches[path]
+    
+    def _gem_script_key(self, gem_data: dict) -> str:
+        """Cache key for a gem: its HN id and a hash of everything sent to Gemini for it"""
+        digest = hashlib.sha256(
+            f"{self.MODEL_NAME}\n{self.SCRIPT_INSTRUCTIONS}\n{self._create_gem_prompt(gem_data)}".encode('utf-8')
+        ).hexdigest()
+        return f"{gem_data.get('hn_id')}:{digest[:16]}"
+    
+    def _load_gem_script(self, gem_data: dict) -> Optional[str]:
+        """Return the cached script for a gem, or None if it must be generated"""
+        if self._script_cache is None:
+            return None
+        try:
+            with self._script_cache_lock:
+                row = self._script_cache.execute(
+                    "SELECT script FROM gem_script_cache WHERE key = ?", (self._gem_script_key(gem_data),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading gem script cache: {e}")
+            return None
+        return row[0] if row else None
+    
+    def _store_gem_script(self, gem_data: dict, script: str):
+        """Cache a script Gemini generated for a gem"""
+        if self._script_cache is None:
+            return
+        try:
+            with self._script_cache_lock, self._script_cache:
+                self._script_cache.execute(
+                    "INSERT OR REPLACE INTO gem_script_cache (key, script, created) VALUES (?, ?, ?)",
+                    (self._gem_script_key(gem_data), script, time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing gem script cache: {e}")
+    
     def _create_intro(self, gem_count: int, date: str) -> str:
         """Create podcast introduction"""
         # Parse date for more natural speech
@@ -129,16 +433,16 @@ Until next time, keep discovering the hidden treasures of the tech world."""
     
     def _generate_gem_script(self, gem_data: dict) -> str:
         """Generate script segment for a single gem using Gemini"""
-        prompt = self._create_gemini_prompt(gem_data)
-        
         try:
             response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config
+                self._create_gemini_prompt(gem_data),
+                generation_config=self.gem_generation_config
             )
             
             raw_script = response.text
             optimized_script = self._optimize_text_for_tts(raw_script)
+            if optimized_script:
+                self._store_gem_script(gem_data, optimized_script)
             return optimized_script
             
         except Exception as e:
@@ -148,32 +452,25 @@ Until next time, keep discovering the hidden treasures of the tech world."""
     
     def _create_gemini_prompt(self, gem_data: dict) -> str:
         """Create Gemini prompt for script generation"""
+        return f"{self.SCRIPT_INSTRUCTIONS}\n\n{self._create_gem_prompt(gem_data)}"
+    
+    def _create_gem_prompt(self, gem_data: dict) -> str:
+        """Create the per-gem part of the Gemini prompt"""
         analysis = gem_data.get('analysis', {})
         
+        # Trim long analyses at a word boundary to keep input tokens down
+        detailed_analysis = analysis.get('detailed_analysis', '')
+        if len(detailed_analysis) > self.PROMPT_ANALYSIS_CHARS:
+            detailed_analysis = detailed_analysis[:self.PROMPT_ANALYSIS_CHARS].rsplit(' ', 1)[0] + '...'
+        
         # Filter out numerical scores to prevent LLM from mentioning them
         filtered_analysis = {
-            'detailed_analysis': analysis.get('detailed_analysis', ''),
-            'strengths': analysis.get('strengths', []),
-            'areas_for_improvement': analysis.get('areas_for_improvement', [])
+            'detailed_analysis': detailed_analysis,
+            'strengths': analysis.get('strengths', [])[:self.PROMPT_LIST_ITEMS],
+            'areas_for_improvement': analysis.get('areas_for_improvement', [])[:self.PROMPT_LIST_ITEMS]
         }
         
-        prompt = f"""You are an experienced podcast host for tech content. Convert the following HN Super Gems analysis into a natural, flowing podcast script segment in English.
-
-IMPORTANT for audio optimization:
-- Simplify URLs (e.g. "github dot com slash username slash project" instead of full URL)
-- Format technical terms for speech-friendly pronunciation
-- Create natural transitions between topics
-- Add pause markers (...) for better listening flow
-- No visual elements (stars, dots) - describe verbally
-- Keep segment to 1-2 minutes (150-300 words) for efficient processing
-
-Structure:
-1. Brief introduction for this gem
-2. Explain the problem/innovation
-3. Technical highlights and implementation details
-4. Conclusion
-
-Post Title: {gem_data.get('title', 'Unknown Title')}
+        prompt = f"""Post Title: {gem_data.get('title', 'Unknown Title')}
 Post URL: {gem_data.get('url', 'No URL')}
 Author: {gem_data.get('author', 'Unknown Author')} (karma: {gem_data.get('author_karma', 0)})
 
@@ -209,17 +506,18 @@ Generate a 1-2 minute script segment for this individual gem (this is one of mul
         has_demo = badges.get('has_demo', False)
         
         # Build implementation details from factual GitHub metrics
-        implementation_details = ""
+        details = []
         if github_stars > 0:
-            implementation_details = f" The repository shows strong development practices with {github_stars} stars"
+            details.append(f" The repository shows strong development practices with {github_stars} stars")
             if has_demo:
-                implementation_details += " and includes a working demo"
+                details.append(" and includes a working demo")
             if is_open_source:
-                implementation_details += ", and it's open source for community collaboration"
+                details.append(", and it's open source for community collaboration")
         elif is_open_source:
-            implementation_details = " As an open source project, it encourages transparency and community contribution"
+            details.append(" As an open source project, it encourages transparency and community contribution")
         elif has_demo:
-            implementation_details = " There's a working demo available for you to try"
+            details.append(" There's a working demo available for you to try")
+        implementation_details = "".join(details)
         
         script = f"""Our next hidden gem comes from {author}, with a project called "{title}".
 
@@ -233,50 +531,11 @@ Overall, this gem demonstrates the value of paying attention to contributions fr
     
     def _optimize_text_for_tts(self, text: str) -> str:
         """Optimize text for text-to-speech synthesis"""
-        # URL handling
-        text = re.sub(r'https?://github\.com/([^/]+)/([^/\s]+)', r'github repository by \1', text)
-        text = re.sub(r'https?://([^/\s]+)\.com[^\s]*', r'\1 dot com', text)
-        text = re.sub(r'https?://([^/\s]+)\.[a-z]{2,4}[^\s]*', r'\1 website', text)
-        
-        # Technical term handling
-        text = re.sub(r'\bAPI\b', 'A P I', text)
-        text = re.sub(r'\bML\b', 'machine learning', text)
-        text = re.sub(r'\bAI\b', 'artificial intelligence', text)
-        text = re.sub(r'\bJS\b', 'JavaScript', text)
-        text = re.sub(r'\bCSS\b', 'C S S', text)
-        text = re.sub(r'\bHTML\b', 'H T M L', text)
-        text = re.sub(r'\bSQL\b', 'S Q L', text)
-        text = re.sub(r'\bCLI\b', 'command line interface', text)
-        text = re.sub(r'\bGUI\b', 'graphical user interface', text)
-        text = re.sub(r'\bOS\b', 'operating system', text)
-        text = re.sub(r'\bUI\b', 'user interface', text)
-        text = re.sub(r'\bUX\b', 'user experience', text)
-        
-        # Ratings conversion
-        text = re.sub(r'⭐{5}', 'five out of five stars', text)
-        text = re.sub(r'⭐{4}', 'four out of five stars', text)
-        text = re.sub(r'⭐{3}', 'three out of five stars', text)
-        text = re.sub(r'⭐{2}', 'two out of five stars', text)
-        text = re.sub(r'⭐{1}', 'one out of five stars', text)
-        
-        # Dot indicators
-        text = re.sub(r'●●●●', 'exceptional rating', text)
-        text = re.sub(r'●●●', 'excellent rating', text)
-        text = re.sub(r'●●', 'good rating', text)
-        text = re.sub(r'●', 'basic rating', text)
-        
-        # Pause and emphasis markers
-        text = re.sub(r'\.\.\.\s*', '... ', text)  # Ensure space after pauses
-        text = re.sub(r'\n\n+', '\n\n', text)  # Clean up multiple newlines
-        
-        # Code snippets removal (replace with description)
-        text = re.sub(r'```[^`]*```', '[code example]', text)
-        text = re.sub(r'`[^`]+`', '[code term]', text)
-        
-        # Clean up extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        for pattern, replacement in _TTS_SUBS:
+            text = pattern.sub(replacement, text)
+        
+        # Clean up extra whitespace, newlines included
+        return ' '.join(text.split())
     
     def _create_empty_script(self) -> Dict[str, Any]:
         """Create an empty script when no gems are provided"""
@@ -11,9 +11,23 @@ This module provides functionality to detect duplicate posts based on various cr
 import difflib
 import hashlib
 import re
+import zlib
 from typing import List, Dict, Tuple, Optional
+from itertools import combinations, repeat
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
+# MinHash/LSH blocking for find_duplicates_in_list, as (bands, rows) per field.
+# A title at the 0.85 ratio threshold can share as little as ~0.3 of its
+# 3-gram shingles, which 64 bands of 2 rows bucket together 99.7% of the time;
+# URLs must match at 0.95 (Jaccard ~0.8), so 4-row bands keep the shingles
+# every URL shares (".com/") from bucketing unrelated URLs together
+_SHINGLE_SIZE = 3
+_TEXT_BANDS = (64, 2)
+_URL_BANDS = (16, 4)
+
+# Lists this short are compared pair by pair, which is exact and still cheap
+_FULL_SCAN_MAX_POSTS = 200
+
 class DuplicateDetector:
     """Detects duplicate posts using multiple criteria."""
     
@@ -151,14 +165,44 @@ class DuplicateDetector:
         Returns:
             Similarity score between 0.0 and 1.0
         """
-        if not text1 and not text2:
+        if text1 == text2:
             return 1.0
         if not text1 or not text2:
             return 0.0
-            
+        
         # Use difflib for sequence matching
         return difflib.SequenceMatcher(None, text1, text2).ratio()
     
+    def _bounded_similarity(self, text1: str, text2: str, threshold: float) -> Tuple[float, bool]:
+        """
+        Calculate similarity, stopping early once it provably falls below threshold.
+        
+        Args:
+            text1: First text string
+            text2: Second text string
+            threshold: Score the caller compares against
+            
+        Returns:
+            Tuple of (score, exact). When exact is False the score is an upper
+            bound on the similarity, and is below threshold.
+        """
+        if text1 == text2 or not text1 or not text2:
+            return self.calculate_similarity(text1, text2), True
+        
+        # ratio() can't exceed 2*min/(len1+len2); this is real_quick_ratio()
+        # without building the matcher
+        lo, hi = sorted((len(text1), len(text2)))
+        bound = 2 * lo / (lo + hi)
+        if bound < threshold:
+            return bound, False
+        
+        # Use difflib for sequence matching, with the cheaper upper bound first
+        matcher = difflib.SequenceMatcher(None, text1, text2)
+        bound = matcher.quick_ratio()
+        if bound < threshold:
+            return bound, False
+        return matcher.ratio(), True
+    
     def get_content_hash(self, title: str, url: str, text: str) -> str:
         """
         Generate a hash of normalized content for quick duplicate detection.
@@ -206,10 +250,20 @@ class DuplicateDetector:
         
         same_author = author1 == author2 and author1 != ''
         
-        # Calculate similarity scores
-        url_similarity = self.calculate_similarity(url1, url2) if url1 and url2 else 0.0
-        title_similarity = self.calculate_similarity(title1, title2)
-        content_similarity = self.calculate_similarity(text1, text2) if text1 and text2 else 0.0
+        # Calculate similarity scores; same-author pairs are held to the lower threshold
+        title_threshold = self.title_similarity_threshold
+        content_threshold = self.content_similarity_threshold
+        if same_author:
+            title_threshold = min(title_threshold, self.same_author_threshold)
+            content_threshold = min(content_threshold, self.same_author_threshold)
+        
+        url_similarity, url_exact = (
+            self._bounded_similarity(url1, url2, self.url_similarity_threshold) if url1 and url2 else (0.0, True)
+        )
+        title_similarity, title_exact = self._bounded_similarity(title1, title2, title_threshold)
+        content_similarity, content_exact = (
+            self._bounded_similarity(text1, text2, content_threshold) if text1 and text2 else (0.0, True)
+        )
         
         similarity_scores = {
             'url_similarity': url_similarity,
@@ -244,11 +298,23 @@ class DuplicateDetector:
             duplicate_reasons.append(f"Content similarity: {content_similarity:.3f}")
         
         # Same author posting very similar content
-        if same_author and (
+        same_author_match = same_author and (
             title_similarity >= self.same_author_threshold or 
             content_similarity >= self.same_author_threshold
-        ):
+        )
+        if same_author_match:
             is_duplicate = True
+        
+        # Fields ruled out early hold an upper bound; duplicates report their real scores
+        if is_duplicate:
+            if not url_exact:
+                similarity_scores['url_similarity'] = url_similarity = self.calculate_similarity(url1, url2)
+            if not title_exact:
+                similarity_scores['title_similarity'] = title_similarity = self.calculate_similarity(title1, title2)
+            if not content_exact:
+                similarity_scores['content_similarity'] = content_similarity = self.calculate_similarity(text1, text2)
+        
+        if same_author_match:
             if f"Same author, title similarity: {title_similarity:.3f}" not in duplicate_reasons:
                 duplicate_reasons.append(f"Same author, similar content (T:{title_similarity:.3f}, C:{content_similarity:.3f})")
         
@@ -258,10 +324,85 @@ class DuplicateDetector:
         
         return is_duplicate, similarity_scores
     
+    def _minhash_bands(self, text: str, bands: int, rows: int) -> List[Tuple[int, ...]]:
+        """
+        Split the MinHash signature of text's character shingles into LSH bands.
+        
+        Args:
+            text: Normalized text
+            bands: Number of bands
+            rows: Signature rows per band
+            
+        Returns:
+            One tuple of minimum hashes per band (empty for empty text)
+        """
+        if not text:
+            return []
+        
+        shingles = {
+            zlib.crc32(text[i:i + _SHINGLE_SIZE].encode('utf-8'))
+            for i in range(max(len(text) - _SHINGLE_SIZE + 1, 1))
+        }
+        
+        # Hashing (seed, shingle) tuples gives one hash function per seed; int
+        # hashes aren't salted, so the buckets are the same in every process
+        signature = [
+            min(map(hash, zip(repeat(seed), shingles)))
+            for seed in range(bands * rows)
+        ]
+        
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(bands)]
+    
+    def _candidate_pairs(self, posts: List[Dict]) -> List[Tuple[int, int]]:
+        """
+        Find index pairs of posts worth an exact is_duplicate check.
+        
+        Posts are bucketed by the LSH bands of their normalized title, URL and
+        content, and by author since same-author pairs use the lower
+        threshold; only posts sharing a bucket become candidates.
+        
+        Args:
+            posts: List of post dictionaries
+            
+        Returns:
+            Sorted list of (i, j) index pairs with i < j
+        """
+        buckets = {}
+        for index, post in enumerate(posts):
+            title = self.normalize_title(post.get('title', ''))
+            # The scheme is shared by nearly every URL and would dominate the bands
+            url = self.normalize_url(post.get('url', '')).split('://', 1)[-1]
+            text = self.normalize_content(post.get('text', ''))
+            author = (post.get('author') or '').lower()
+            
+            keys = [('title', band_idx, band) for band_idx, band in enumerate(self._minhash_bands(title, *_TEXT_BANDS))]
+            if not title:
+                # Empty titles compare as identical
+                keys.append(('title', None))
+            keys.extend(('url', band_idx, band) for band_idx, band in enumerate(self._minhash_bands(url, *_URL_BANDS)))
+            keys.extend(('text', band_idx, band) for band_idx, band in enumerate(self._minhash_bands(text, *_TEXT_BANDS)))
+            if author:
+                keys.append(('author', author))
+            
+            for key in keys:
+                buckets.setdefault(key, []).append(index)
+        
+        pairs = set()
+        for indices in buckets.values():
+            if len(indices) > 1:
+                pairs.update(combinations(indices, 2))
+        
+        return sorted(pairs)
+    
     def find_duplicates_in_list(self, posts: List[Dict]) -> List[Tuple[Dict, Dict, Dict]]:
         """
         Find all duplicate pairs in a list of posts.
         
+        Lists of up to _FULL_SCAN_MAX_POSTS posts are compared pair by pair.
+        In longer lists fuzzy matches are only checked for candidate pairs from
+        MinHash/LSH blocking, so pairs with little shingle overlap are never
+        compared; a true duplicate can occasionally be missed.
+        
         Args:
             posts: List of post dictionaries
             
@@ -272,12 +413,14 @@ class DuplicateDetector:
         
         # Create content hashes for quick screening
         post_hashes = {}
+        content_hashes = []
         for post in posts:
             content_hash = self.get_content_hash(
                 post.get('title', ''),
                 post.get('url', ''),
                 post.get('text', '')
             )
+            content_hashes.append(content_hash)
             if content_hash in post_hashes:
                 # Exact content match found
                 post_hashes[content_hash].append(post)
@@ -300,27 +443,19 @@ class DuplicateDetector:
                         }
                         duplicates.append((hash_posts[i], hash_posts[j], similarity_data))
         
-        # Then check for fuzzy matches
-        for i in range(len(posts)):
-            for j in range(i + 1, len(posts)):
-                # Skip if already found as exact match
-                hash1 = self.get_content_hash(
-                    posts[i].get('title', ''), 
-                    posts[i].get('url', ''), 
-                    posts[i].get('text', '')
-                )
-                hash2 = self.get_content_hash(
-                    posts[j].get('title', ''), 
-                    posts[j].get('url', ''), 
-                    posts[j].get('text', '')
-                )
-                
-                if hash1 == hash2:
-                    continue  # Already processed as exact match
-                
-                is_dup, similarity = self.is_duplicate(posts[i], posts[j])
-                if is_dup:
-                    duplicates.append((posts[i], posts[j], similarity))
+        # Then check for fuzzy matches, among the LSH candidates for long lists
+        if len(posts) <= _FULL_SCAN_MAX_POSTS:
+            pairs = combinations(range(len(posts)), 2)
+        else:
+            pairs = self._candidate_pairs(posts)
+        
+        for i, j in pairs:
+            if content_hashes[i] == content_hashes[j]:
+                continue  # Already processed as exact match
+            
+            is_dup, similarity = self.is_duplicate(posts[i], posts[j])
+            if is_dup:
+                duplicates.append((posts[i], posts[j], similarity))
         
         return duplicates
     
@@ -0,0 +1,63 @@
+"""
+Small in-memory cache with per-entry expiry.
+
+Used to keep slow-changing remote data (HN user profiles, etc.) around between
+scheduler runs without adding a caching dependency.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire after a fixed time-to-live."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries; the oldest entry is evicted first
+            ttl: Seconds an entry stays valid after it was set
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store value for key, evicting the oldest entries if over maxsize."""
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
@@ -1,6 +1,8 @@
 import os
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from flask import Blueprint, render_template, jsonify, request, current_app, send_from_directory, send_file
+from werkzeug.exceptions import NotFound
 from hn_hidden_gems.models import Post, QualityScore, HallOfFame, User, AudioMetadata, PodcastScript
 from hn_hidden_gems.utils.logger import setup_logger
 
@@ -47,6 +49,31 @@ def serve_audio(filename):
     except FileNotFoundError:
         return jsonify({'error': 'Audio file not found'}), 404
 
+@lru_cache(maxsize=4)
+def _latest_audio_name(pointer_path, mtime_ns):
+    """Filename recorded in latest.txt; keyed on mtime so new generations are picked up."""
+    with open(pointer_path, encoding='utf-8') as f:
+        return f.read().strip()
+
+@main.route('/latest.<any(mp3, ogg):ext>')
+def serve_latest_audio(ext):
+    """Serve the latest audio file named by the latest.txt pointer."""
+    audio_dir = current_app.config.get('AUDIO_STORAGE_PATH', 'static/audio')
+    pointer_path = os.path.join(current_app.root_path, audio_dir, 'latest.txt')
+    try:
+        filename = _latest_audio_name(pointer_path, os.stat(pointer_path).st_mtime_ns)
+    except FileNotFoundError:
+        filename = None
+    
+    if not filename or not filename.endswith(f'.{ext}'):
+        # No pointer yet, or the newest audio is in another format; the
+        # symlink still names the latest file of this format
+        filename = f'latest.{ext}'
+    try:
+        return send_from_directory(audio_dir, filename)
+    except NotFound:
+        return jsonify({'error': 'Audio file not found'}), 404
+
 @main.route('/sw.js')
 def service_worker():
     """Serve service worker file."""
@@ -372,9 +399,11 @@ def get_super_gems_audio_by_date(date):
         # Parse date
         target_date = datetime.strptime(date, '%Y-%m-%d').date()
         
-        # Find audio file for that date
-        filename_pattern = f"{date}_super-gems.mp3"
-        audio_metadata = AudioMetadata.find_by_filename(filename_pattern)
+        # Find audio file for that date (MP3, or Ogg Opus when TTS_AUDIO_ENCODING=OGG_OPUS)
+        audio_metadata = (
+            AudioMetadata.find_by_filename(f"{date}_super-gems.mp3")
+            or AudioMetadata.find_by_filename(f"{date}_super-gems.ogg")
+        )
         
         if not audio_metadata:
             return jsonify({'error': f'No audio available for {date}'}), 404
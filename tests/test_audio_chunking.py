@@ -0,0 +1,75 @@
+"""Tests for keeping TTS request chunks within the input byte limit."""
+
+import pytest
+
+pytest.importorskip("google.cloud.texttospeech")
+
+from hn_hidden_gems.services.audio_service import AudioService
+
+
+def make_service(use_ssml):
+    """AudioService with only the state chunking needs, without connecting a client."""
+    service = AudioService.__new__(AudioService)
+    service.use_ssml = use_ssml
+    return service
+
+
+def assert_within_limits(service, chunks, max_chunk_size):
+    assert chunks
+    for chunk in chunks:
+        assert len(chunk) <= max_chunk_size
+        assert service._input_bytes(chunk) <= AudioService.TTS_MAX_INPUT_BYTES
+
+
+def squeeze(text):
+    return ''.join(text.split())
+
+
+@pytest.mark.parametrize("use_ssml", [False, True])
+def test_multibyte_sentence_without_spaces_is_split_by_bytes(use_ssml):
+    service = make_service(use_ssml)
+    # Three UTF-8 bytes per character, so 3500 characters are over twice the byte limit
+    text = "日本語の長い文章" * 1000 + "."
+
+    chunks = service._split_text_into_chunks(text)
+
+    assert_within_limits(service, chunks, 3500)
+    assert squeeze(''.join(chunks)) == squeeze(text)
+
+
+def test_ssml_escaping_counts_toward_the_byte_limit():
+    service = make_service(use_ssml=True)
+    # Each "&" becomes "&amp;" in the SSML document
+    text = ' '.join(["R&D&Q&A"] * 400) + "."
+
+    assert len(text) < 3500 < AudioService.TTS_MAX_INPUT_BYTES < service._input_bytes(text)
+    chunks = service._split_text_into_chunks(text)
+
+    assert len(chunks) > 1
+    assert_within_limits(service, chunks, 3500)
+    assert squeeze(''.join(chunks)) == squeeze(text)
+
+
+@pytest.mark.parametrize("use_ssml", [False, True])
+def test_script_paragraphs_stay_within_the_byte_limit(use_ssml):
+    service = make_service(use_ssml)
+    paragraphs = [
+        "Ünïcödé ünd ëmöjï 🎧 & sömë <märkup>. " * 30,
+        "Short paragraph.",
+        "すべての章は長いです。" * 200,
+    ]
+    script = "\n\n".join(paragraphs)
+
+    chunks = service._split_script_into_chunks(script)
+
+    assert_within_limits(service, chunks, AudioService.PARALLEL_CHUNK_SIZE)
+
+
+def test_hard_split_prefers_spaces():
+    service = make_service(use_ssml=False)
+    text = ("wörd " * 2000).strip()
+
+    pieces = service._hard_split(text, 3500)
+
+    assert_within_limits(service, pieces, 3500)
+    assert all(set(piece.split()) == {"wörd"} for piece in pieces)
@@ -0,0 +1,60 @@
+"""Tests for the duplicate detector's LSH blocking."""
+
+import random
+from itertools import combinations
+
+from hn_hidden_gems.utils.duplicate_detector import DuplicateDetector
+
+WORDS = ("new version model the database in source open tool fast rust "
+         "python web server release show ask language kernel memory").split()
+
+
+def make_posts(seed, count):
+    """Random posts from a small vocabulary, about a third of them near-copies of earlier titles."""
+    rng = random.Random(seed)
+    posts = []
+    for hn_id in range(count):
+        if posts and rng.random() < 0.3:
+            title = list(rng.choice(posts)['title'])
+            for _ in range(rng.randint(1, 3)):
+                index = rng.randrange(len(title))
+                if title[index] != ' ':
+                    title[index] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+            title = ''.join(title)
+        else:
+            title = ' '.join(rng.choices(WORDS, k=rng.randint(3, 6)))
+        posts.append({
+            'hn_id': hn_id,
+            'title': title,
+            'url': f"https://site{rng.randint(0, 5000)}.com/{rng.randint(0, 10**6)}",
+            'text': '',
+            'author': f"user{rng.randint(0, 10**5)}",
+        })
+    return posts
+
+
+def brute_force_pairs(detector, posts):
+    """hn_id pairs found by checking every pair with is_duplicate."""
+    return {
+        (post1['hn_id'], post2['hn_id'])
+        for post1, post2 in combinations(posts, 2)
+        if detector.is_duplicate(post1, post2)[0]
+    }
+
+
+def test_lsh_blocking_matches_full_scan():
+    detector = DuplicateDetector()
+    posts = make_posts(seed=1, count=300)
+
+    expected = brute_force_pairs(detector, posts)
+    found = {(post1['hn_id'], post2['hn_id']) for post1, post2, _ in detector.find_duplicates_in_list(posts)}
+
+    assert expected
+    assert found == expected
+
+
+def test_lsh_candidates_skip_most_pairs():
+    detector = DuplicateDetector()
+    posts = make_posts(seed=2, count=300)
+
+    assert len(detector._candidate_pairs(posts)) < len(posts) * (len(posts) - 1) // 2 // 2
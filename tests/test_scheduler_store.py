@@ -0,0 +1,59 @@
+"""Tests for the collection scheduler's batched post inserts."""
+
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from hn_hidden_gems.models import db, init_db, Post, QualityScore, User
+from hn_hidden_gems.scheduler import PendingPost, PostCollectionScheduler
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    init_db(app)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+def make_pending(hn_id, author='alice'):
+    post = Post(
+        hn_id=hn_id,
+        title=f"Show HN: Project {hn_id}",
+        author=author,
+        hn_created_at=datetime(2024, 1, 1)
+    )
+    score_row = QualityScore.row_from_scores({'overall_interest': 0.5, 'spam_likelihood': 0.1})
+    return PendingPost(post, score_row, {'karma': 10})
+
+
+def stored_hn_ids():
+    return sorted(hn_id for (hn_id,) in db.session.query(Post.hn_id))
+
+
+def test_batch_is_stored_with_scores(app):
+    stored, failed = PostCollectionScheduler()._store_post_batch([make_pending(1), make_pending(2, 'bob')])
+
+    assert [pending.post.hn_id for pending in stored] == [1, 2]
+    assert failed == 0
+    assert stored_hn_ids() == [1, 2]
+    assert QualityScore.query.count() == 2
+    assert {user.username for user in User.query} == {'alice', 'bob'}
+
+
+def test_failed_batch_falls_back_to_row_inserts(app, caplog):
+    PostCollectionScheduler()._store_post_batch([make_pending(2)])
+
+    # hn_id 2 is already stored, so the batch INSERT hits the UNIQUE constraint
+    stored, failed = PostCollectionScheduler()._store_post_batch(
+        [make_pending(1), make_pending(2), make_pending(3)]
+    )
+
+    assert "retrying individually" in caplog.text
+    assert [pending.post.hn_id for pending in stored] == [1, 3]
+    assert failed == 0
+    assert stored_hn_ids() == [1, 2, 3]
+    assert QualityScore.query.count() == 3